@@ -1,30 +1,143 @@
-from sqlalchemy import create_engine
+"""
+Lazy Postgres connection setup.
+
+Nothing connects at import time. The engine is created on first use, and database health is
+probed in a background thread with a short connect timeout, so a page never blocks on a database
+that is down: `db_available()` answers from the latest probe and is False until one succeeds.
+Schema creation is a separate migration step (`python -m backend.db_setup migrate`), not part of
+every import.
+
+Functions:
+- get_engine(): The shared engine, created on first call.
+- get_session(): A new session bound to the engine.
+- SessionLocal(): Same as get_session, under the name existing callers import.
+- db_available(): Latest health probe result; starts the probe thread on first call.
+- check_health(): Runs one probe synchronously.
+- migrate(): Creates all tables defined in the models.
+
+Global Variables:
+- DATABASE_URL: Connection URL.
+- CONNECT_TIMEOUT: Seconds a connection attempt may take.
+- PROBE_INTERVAL: Seconds between background health probes.
+"""
+
+import sys
+import threading
+import time
+from sqlalchemy import text
 from sqlalchemy.orm import sessionmaker
-from backend.models.models import Base
 from sqlalchemy.engine import URL, create_engine
 
-try:
+DATABASE_URL = URL.create(
+    drivername="postgresql+psycopg2",
+    username="postgres",
+    password="password",
+    host="localhost",
+    port=5432,
+    database="asset_analysis"
+)
+CONNECT_TIMEOUT = 2
+PROBE_INTERVAL = 30
+
+# Session factory, bound to the engine when the engine is created
+_session_factory = sessionmaker(autocommit=False, autoflush=False)
+
+# Example usage:
+# with get_session() as session:
+#     # Perform database operations here
+#     pass
+
+_engine = None
+_lock = threading.Lock()
+_health = {'ok': False, 'checked_at': None, 'error': None}
+_probe_thread = None
+
+
+def get_engine():
+    """
+    Returns:
+    - Engine: The shared engine; creating it does not connect.
+    """
+    global _engine
+    with _lock:
+        if _engine is None:
+            _engine = create_engine(
+                DATABASE_URL,
+                pool_pre_ping=True,
+                connect_args={'connect_timeout': CONNECT_TIMEOUT}
+            )
+            _session_factory.configure(bind=_engine)
+    return _engine
+
+
+def get_session(**kwargs):
+    get_engine()
+    return _session_factory(**kwargs)
+
+
+def SessionLocal(**kwargs):
+    """
+    Session factory kept for callers written against the eager setup (`with SessionLocal() as session:`);
+    creates the engine on first use, like get_session.
+    """
+    return get_session(**kwargs)
+
+
+def check_health() -> bool:
+    """
+    Connects and runs `SELECT 1`, recording the result for `db_available`.
+
+    Returns:
+    - bool: Whether the database answered within CONNECT_TIMEOUT.
+    """
+    try:
+        with get_engine().connect() as connection:
+            connection.execute(text('SELECT 1'))
+        ok, error = True, None
+    except Exception as e:
+        ok, error = False, str(e)
+        # log the first failure and each outage, not every probe of one
+        if _health['ok'] or _health['checked_at'] is None:
+            print(f'db unavailable: {(error or repr(e)).splitlines()[0]}')
+    _health.update(ok=ok, checked_at=time.time(), error=error)
+    return ok
+
+
+def _probe_loop():
+    while True:
+        check_health()
+        time.sleep(PROBE_INTERVAL)
+
+
+def db_available() -> bool:
+    """
+    Latest health probe result, without waiting on the database. The first call starts the background
+    probe and returns False; pages fall back to running without the database until a probe succeeds.
 
-    engine = create_engine(URL.create(
-        drivername="postgresql+psycopg2",
-        username="postgres",
-        password="password",
-        host="localhost",
-        port=5432,
-        database="asset_analysis"
-    ))
+    Returns:
+    - bool: Whether the last probe reached the database.
+    """
+    global _probe_thread
+    with _lock:
+        if _probe_thread is None:
+            _probe_thread = threading.Thread(target=_probe_loop, name='db-health-probe', daemon=True)
+            _probe_thread.start()
+    return _health['ok']
 
-    # Create all tables defined in the models
-    Base.metadata.create_all(engine)
 
-    # Create a session factory
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def migrate():
+    """
+    Creates all tables defined in the models that do not exist yet. Run once per deployment:
+    `python -m backend.db_setup migrate`.
+    """
+    from backend.models.models import Base
+    Base.metadata.create_all(get_engine())
+    print('db migration complete')
 
-    # Example usage:
-    # with SessionLocal() as session:
-    #     # Perform database operations here
-    #     pass
 
-except:
-    SessionLocal = None
-    print('db setup failed. debug db_setup.py')
\ No newline at end of file
+if __name__ == '__main__':
+    if sys.argv[1:] == ['migrate']:
+        migrate()
+    else:
+        print('usage: python -m backend.db_setup migrate')
+        sys.exit(2)
@@ -0,0 +1,159 @@
+"""
+Process-wide cache of fetched price history, expiring at the next bar close.
+
+Streamlit reruns the whole page on every widget change, so without a cache toggling a chart type
+or an indicator refetches the full price history. Entries are keyed by (source, symbol, interval,
+bar_count) and stay valid until the current bar of that interval closes, when a new bar can exist.
+The cache lives at module level, so every session in the server process shares it.
+
+Bar closes follow each interval's `FetchConfig`: boundaries are `bar_anchor` plus a whole number of
+bars past midnight in `session_tz`. The crypto sources bucket candles from midnight UTC (the
+defaults); yfinance daily bars close at 16:00 New York time and its hourly bars start at the 9:30
+open. An interval whose boundaries are configured wrong is served stale until the configured
+boundary, so a new source needs its anchor set.
+
+Classes:
+- BarCache: The cache, with hit/miss counters.
+
+Global Variables:
+- bar_cache: The shared instance used by `display.display_ticker_data`.
+"""
+
+import threading
+import time
+import typing as t
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+import pandas as pd
+
+
+def next_bar_close(interval: timedelta, now=None, anchor=timedelta(0), tz='UTC') -> float:
+    """
+    Unix time at which the bar containing `now` closes.
+
+    Parameters:
+    - interval (timedelta): The bar length.
+    - now (float, optional): Unix time. Defaults to the current time.
+    - anchor (timedelta, optional): Offset of the bar boundaries from midnight. Defaults to 0.
+    - tz (str, optional): Time zone the boundaries are set in. Defaults to 'UTC'.
+
+    Returns:
+    - float: Unix time of the next bar boundary after `now`.
+    """
+    now = time.time() if now is None else now
+    seconds = interval.total_seconds()
+    zone = ZoneInfo(tz)
+
+    def utc_offset(moment):
+        return datetime.fromtimestamp(moment, zone).utcoffset().total_seconds()
+
+    # boundaries are counted in wall-clock seconds of `tz`, so they stay on the local session across DST
+    local = now + utc_offset(now) - anchor.total_seconds()
+    boundary = (local // seconds + 1) * seconds + anchor.total_seconds()
+    close = boundary - utc_offset(now)
+    # the offset at the boundary decides when it happens, if DST changed in between
+    return boundary - utc_offset(close)
+
+
+@dataclass
+class _Entry:
+    data: pd.DataFrame
+    fetched_at: float
+    expires_at: float
+
+
+class BarCache:
+    """
+    Price-history cache keyed by (source, symbol, interval, bar_count).
+
+    Attributes:
+    - hits (int): Requests answered from the cache.
+    - misses (int): Requests that fetched.
+    - max_items (int): Entries kept before the soonest-expiring ones are dropped.
+
+    Methods:
+    - get_or_fetch(key, config, fetch, max_age): Returns a cached frame or fetches and stores one.
+    - invalidate(key): Drops one entry, or everything when key is None.
+    - stats(): Counters and size, for display.
+    """
+    def __init__(self, max_items=256):
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self._entries: t.Dict[tuple, _Entry] = {}
+        self._lock = threading.Lock()
+        # one lock per key so concurrent sessions asking for the same series fetch it once;
+        # kept only while some request holds or waits on it
+        self._key_locks: t.Dict[tuple, t.Tuple[threading.Lock, int]] = {}
+
+    def _valid(self, entry: t.Optional[_Entry], now: float, max_age) -> bool:
+        if entry is None or now >= entry.expires_at:
+            return False
+        return max_age is None or now - entry.fetched_at < max_age
+
+    def get_or_fetch(self, key: tuple, config, fetch: t.Callable[[], pd.DataFrame], max_age=None) -> pd.DataFrame:
+        """
+        Parameters:
+        - key (tuple): (source, symbol, interval, bar_count).
+        - config (FetchConfig): The interval's fetch config; its next bar close sets the expiry.
+        - fetch (callable): Fetches the price history on a miss.
+        - max_age (float, optional): Also refetch entries older than this many seconds (live mode).
+
+        Returns:
+        - pd.DataFrame: A copy of the cached price history.
+        """
+        with self._lock:
+            key_lock, users = self._key_locks.get(key, (None, 0))
+            key_lock = key_lock or threading.Lock()
+            self._key_locks[key] = (key_lock, users + 1)
+        try:
+            with key_lock:
+                return self._get_or_fetch(key, config, fetch, max_age)
+        finally:
+            with self._lock:
+                _, users = self._key_locks[key]
+                if users == 1:
+                    del self._key_locks[key]
+                else:
+                    self._key_locks[key] = (key_lock, users - 1)
+
+    def _get_or_fetch(self, key, config, fetch, max_age):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if self._valid(entry, now, max_age):
+                self.hits += 1
+                return entry.data.copy()
+            self.misses += 1
+        data = fetch()
+        now = time.time()
+        with self._lock:
+            self._entries[key] = _Entry(data, now, config.next_close(now))
+            self._evict(now)
+        return data.copy()
+
+    def _evict(self, now):
+        expired = [key for key, entry in self._entries.items() if now >= entry.expires_at]
+        for key in expired:
+            del self._entries[key]
+        if len(self._entries) > self.max_items:
+            by_expiry = sorted(self._entries, key=lambda key: self._entries[key].expires_at)
+            for key in by_expiry[:len(self._entries) - self.max_items]:
+                del self._entries[key]
+
+    def invalidate(self, key: t.Optional[tuple] = None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+
+bar_cache = BarCache()
+"""
+Shared instance used by `display.display_ticker_data`.
+"""
@@ -0,0 +1,213 @@
+"""
+Background worker keeping the bar cache and chart caches warm for watchlist entries.
+
+Each target (source, symbol, interval, bar count, chart type, indicators) is refreshed shortly after
+every bar close of its interval, which is exactly when its bar cache entry expires. A refresh loads
+the chart data the way the page does (`display.load_chart_data`) and builds the chart layers
+(`plot_historical_data`), which fills the bar cache, the indicator result cache and the figure
+cache. Opening the page of a watched symbol then finds all three warm. Upstream requests go
+through the shared per-source rate limiters, so warming never pushes a source past its limit.
+
+Targets come from the watchlist page: each session registers its own entries, and the worker
+warms the union of all sessions' entries. Bar count, chart type and indicators are taken from the
+saved page args of the same symbol, source and interval, so the warmed entries are the ones that
+page will ask for. The page re-registers every OWNER_HEARTBEAT seconds while it is open; a session
+not heard from for `owner_ttl` (a few heartbeats) is dropped with its targets, so closed sessions
+stop costing upstream requests.
+
+Classes:
+- WarmTarget: One chart to keep warm.
+- CacheWarmer: The worker.
+
+Functions:
+- watchlist_targets(entries, pages): Targets for watchlist rows.
+
+Global Variables:
+- INTERVAL_ALIASES: Watchlist interval shorthands and their interval names.
+- OWNER_HEARTBEAT: Seconds between re-registrations of an open watchlist page.
+- OWNER_TTL: Seconds without a re-registration before a session's targets are dropped.
+- cache_warmer: The shared instance.
+"""
+
+import heapq
+import threading
+import time
+import typing as t
+from dataclasses import dataclass
+import plotly.graph_objects as go
+from source.code.settings import source_settings
+from source.code.settings_model import FetchArgs
+import source.code.display as display
+from source.code.components.historical_data_plot import plot_historical_data
+
+INTERVAL_ALIASES = {
+    '1m': '1 minute',
+    '5m': '5 minute',
+    '15m': '15 minute',
+    '30m': '30 minute',
+    '1h': '1 hour',
+    '1d': '1 day',
+}
+"""Watchlist interval shorthands and the interval names the sources use."""
+
+DELAY_AFTER_CLOSE = 2
+"""Seconds after a bar close before refetching, so the source has published the closed bar."""
+
+OWNER_HEARTBEAT = 5 * 60
+"""Seconds between re-registrations of an open watchlist page."""
+
+OWNER_TTL = 3 * OWNER_HEARTBEAT
+"""Seconds without a re-registration before a session's targets are dropped."""
+
+
+@dataclass(frozen=True)
+class WarmTarget:
+    """
+    Attributes:
+    - source (str): Data source.
+    - symbol (str): Symbol.
+    - interval (str): Interval name (e.g. '1 hour').
+    - bar_count (int): Bars fetched.
+    - chart_type (str): 'Candlestick' or 'Line'.
+    - indicators (tuple): Indicator names drawn on the chart.
+    """
+    source: str
+    symbol: str
+    interval: str
+    bar_count: int
+    chart_type: str
+    indicators: tuple
+
+
+def watchlist_targets(entries: t.List[dict], pages: t.Dict[str, dict]) -> t.List[WarmTarget]:
+    """
+    Parameters:
+    - entries (list[dict]): Watchlist rows with symbol, interval and data_source.
+    - pages (dict): Saved page args (page name -> FetchArgs dict).
+
+    Returns:
+    - list[WarmTarget]: One target per complete row the source supports, using the matching page's
+      bar count, chart type and indicators (FetchArgs defaults when no page matches).
+    """
+    targets = []
+    for entry in entries:
+        symbol, source = entry.get('symbol'), entry.get('data_source')
+        interval = INTERVAL_ALIASES.get(entry.get('interval'), entry.get('interval'))
+        if not symbol or source not in source_settings.options or interval not in source_settings.get_setting(source).options:
+            continue
+        args = next(
+            (args for args in pages.values()
+             if (args.get('symbol'), args.get('source'), args.get('interval')) == (symbol, source, interval)),
+            FetchArgs(symbol=symbol, source=source, interval=interval)
+        )
+        targets.append(WarmTarget(
+            source, symbol, interval, args['bar_count'], args['chart_type'], tuple(args['indicators'] or [])
+        ))
+    return targets
+
+
+class CacheWarmer:
+    """
+    Daemon thread refreshing each target after every bar close of its interval.
+
+    Attributes:
+    - owner_ttl (float): Seconds after its last sync before a session's targets are dropped.
+
+    Methods:
+    - sync(owner, targets): Replaces the targets registered by one session and starts the worker.
+    - warm(target): Refreshes one target now.
+    - status(): Last refresh time, duration and error of each target.
+    """
+    def __init__(self, owner_ttl=OWNER_TTL):
+        self.owner_ttl = owner_ttl
+        self._owners: t.Dict[str, t.Set[WarmTarget]] = {}
+        self._seen: t.Dict[str, float] = {}
+        self._queue: t.List[t.Tuple[float, int, WarmTarget]] = []
+        self._scheduled: t.Set[WarmTarget] = set()
+        self._status: t.Dict[WarmTarget, dict] = {}
+        self._counter = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def _targets(self) -> t.Set[WarmTarget]:
+        """targets of the sessions seen within `owner_ttl`; called with the lock held"""
+        cutoff = time.time() - self.owner_ttl
+        expired = [owner for owner, seen in self._seen.items() if seen < cutoff]
+        for owner in expired:
+            del self._owners[owner], self._seen[owner]
+        targets = set().union(*self._owners.values()) if self._owners else set()
+        if expired:
+            self._status = {target: status for target, status in self._status.items() if target in targets}
+        return targets
+
+    def _schedule(self, target: WarmTarget, due: float):
+        self._counter += 1
+        heapq.heappush(self._queue, (due, self._counter, target))
+        self._scheduled.add(target)
+
+    def sync(self, owner: str, targets: t.Iterable[WarmTarget]):
+        """
+        Parameters:
+        - owner (str): Id of the registering session.
+        - targets (iterable): That session's current targets; new ones are warmed right away.
+        """
+        with self._lock:
+            self._owners[owner] = set(targets)
+            self._seen[owner] = time.time()
+            for target in self._targets() - self._scheduled:
+                self._schedule(target, time.time())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='cache-warmer', daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def _next_due(self, target: WarmTarget) -> float:
+        return source_settings.get_setting(target.source).get_setting(target.interval).next_close() + DELAY_AFTER_CLOSE
+
+    def warm(self, target: WarmTarget):
+        start = time.time()
+        error = None
+        try:
+            data = display.load_chart_data(target.source, target.symbol, target.interval, target.bar_count)
+            plot_historical_data(go.Figure(), data, target.chart_type, list(target.indicators))
+        except Exception as e:
+            error = str(e)
+            print(f'CacheWarmer: {target.symbol} {target.interval} ({target.source}) failed: {e}')
+        with self._lock:
+            self._status[target] = {'warmed_at': start, 'seconds': time.time() - start, 'error': error}
+
+    def _run(self):
+        while True:
+            # cleared before looking at the queue, so a sync arriving after the check still wakes the wait
+            self._wake.clear()
+            with self._lock:
+                due, _, target = self._queue[0] if self._queue else (None, None, None)
+                if target is not None and due <= time.time():
+                    heapq.heappop(self._queue)
+                    self._scheduled.discard(target)
+                    # targets no session watches any more are dropped here
+                    if target not in self._targets():
+                        continue
+                else:
+                    target = None
+            if target is None:
+                self._wake.wait(None if due is None else max(0.0, due - time.time()))
+                continue
+            self.warm(target)
+            with self._lock:
+                if target in self._targets() and target not in self._scheduled:
+                    self._schedule(target, self._next_due(target))
+
+    def status(self) -> t.List[dict]:
+        with self._lock:
+            return [
+                {**vars(target), 'indicators': ', '.join(target.indicators), **self._status.get(target, {})}
+                for target in sorted(self._targets(), key=lambda target: (target.symbol, target.interval))
+            ]
+
+
+cache_warmer = CacheWarmer()
+"""
+Shared instance, fed by the watchlist page.
+"""
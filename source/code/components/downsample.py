@@ -0,0 +1,180 @@
+"""
+Server-side downsampling of chart traces before they are sent to the browser.
+
+Indicators are computed on the full history, then each trace is reduced to roughly what the chart
+can show: candlesticks are merged into buckets that keep each bucket's open, high, low and close,
+and lines are reduced with Largest-Triangle-Three-Buckets (LTTB), which keeps the points that
+define the line's visual shape. Marker traces (signals, swing points) are mostly NaN, so only their
+non-NaN points are sent, reduced with LTTB when there are still more than the budget. Other trace
+types (bars) are left alone.
+
+A detail range (the most recent bars, or the range the user selected) keeps the full point budget,
+so it is drawn at full resolution once it spans fewer bars than the budget; the rest of the history
+is reduced harder and serves as an overview.
+
+Functions:
+- bucket_ohlc: Min/max-preserving OHLC bucketing.
+- lttb: Indices of the points LTTB keeps.
+- downsample_figure: Applies both to every trace of a figure.
+"""
+
+import typing as t
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+
+def _numeric(x) -> np.ndarray:
+    """
+    x values as floats for distance math. Datetimes become nanoseconds of their wall-clock time, which
+    is how plotly stores and draws tz-aware x values, so aware and naive inputs compare consistently.
+    """
+    x = pd.Series(np.asarray(x))
+    if pd.api.types.is_datetime64_any_dtype(x) or x.dtype == object:
+        try:
+            times = pd.to_datetime(x)
+        except (TypeError, ValueError):
+            return np.arange(len(x), dtype=float)
+        if times.dt.tz is not None:
+            times = times.dt.tz_localize(None)
+        return times.astype('datetime64[ns]').astype('int64').to_numpy(dtype=float)
+    return x.to_numpy(dtype=float)
+
+
+def bucket_ohlc(x, open_, high, low, close, max_points: int):
+    """
+    Merges consecutive bars into at most `max_points` buckets: first open, max high, min low, last close,
+    labelled with the first bar's x, so wicks and gaps are never hidden.
+
+    Returns:
+    - tuple: (x, open, high, low, close) arrays of the buckets.
+    """
+    n = len(close)
+    if n <= max_points:
+        return x, open_, high, low, close
+    size = int(np.ceil(n / max_points))
+    starts = np.arange(0, n, size)
+    ends = np.append(starts[1:], n) - 1
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    return (
+        np.asarray(x)[starts],
+        np.asarray(open_)[starts],
+        np.fmax.reduceat(high, starts),
+        np.fmin.reduceat(low, starts),
+        np.asarray(close)[ends],
+    )
+
+
+def lttb(x, y, max_points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of `max_points` points that best keep the line's shape.
+    NaN values are bridged for the selection only, so gaps stay gaps in the returned points.
+
+    Parameters:
+    - x (array): x values (numeric or datetime).
+    - y (array): y values.
+    - max_points (int): Number of points to keep (at least 3).
+
+    Returns:
+    - np.ndarray: Sorted indices into x/y, always including the first and last point.
+    """
+    n = len(y)
+    if n <= max_points or max_points < 3:
+        return np.arange(n)
+    xs = _numeric(x)
+    ys = pd.Series(np.asarray(y, dtype=float)).interpolate(limit_direction='both').fillna(0).to_numpy()
+
+    # max_points - 2 interior buckets [edges[b], edges[b + 1]); first and last points are kept as-is
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    # the third vertex of bucket b's triangles is the mean of bucket b + 1 (the last point for the final bucket)
+    csum_x = np.concatenate(([0.0], np.cumsum(xs)))
+    csum_y = np.concatenate(([0.0], np.cumsum(ys)))
+    avg_lo = edges[1:]
+    avg_hi = np.append(edges[2:], n)
+    counts = np.maximum(avg_hi - avg_lo, 1)
+    avg_x = (csum_x[avg_hi] - csum_x[avg_lo]) / counts
+    avg_y = (csum_y[avg_hi] - csum_y[avg_lo]) / counts
+
+    keep = np.empty(max_points, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for b in range(max_points - 2):
+        lo, hi = edges[b], edges[b + 1]
+        if hi <= lo:
+            keep[b + 1] = lo
+            a = lo
+            continue
+        bx, by = xs[lo:hi], ys[lo:hi]
+        area = np.abs((xs[a] - avg_x[b]) * (by - ys[a]) - (xs[a] - bx) * (avg_y[b] - ys[a]))
+        a = lo + int(np.argmax(area))
+        keep[b + 1] = a
+    return np.unique(keep)
+
+
+def _detail_bounds(x, detail_range) -> tuple:
+    """index bounds of `detail_range` in the sorted x values, by binary search"""
+    if detail_range is None:
+        return 0, len(x)
+    xs = _numeric(x)
+    # each bound separately, so a tz-aware range still applies to plotly's naive wall-clock x
+    lo, hi = (_numeric([bound])[0] for bound in detail_range)
+    return int(np.searchsorted(xs, lo, side='left')), int(np.searchsorted(xs, hi, side='right'))
+
+
+def _budgets(n, lo, hi, max_points) -> list:
+    """points for the (before, detail, after) segments: the detail range gets the full budget, the overview half"""
+    outside = n - (hi - lo)
+    overview = max_points // 2
+    before = max(2, overview * lo // outside) if lo else 0
+    after = max(2, overview * (n - hi) // outside) if hi < n else 0
+    return [(0, lo, before), (lo, hi, max_points), (hi, n, after)]
+
+
+def downsample_figure(fig: go.Figure, max_candles=600, max_points=1500, detail_range: t.Optional[tuple] = None) -> go.Figure:
+    """
+    Reduces every candlestick, line and marker trace of `fig` in place. Marker-only traces first drop
+    their NaN points (bars without a marker), then the rest is reduced like a line.
+
+    With `detail_range`, bars inside it keep up to the full budget, so a range narrower than the budget is
+    drawn at full resolution, while the bars before and after it share half a budget as an overview.
+
+    Parameters:
+    - fig (go.Figure): The figure, with traces built from the full history (sorted by x).
+    - max_candles (int, optional): Candlestick buckets to keep. Defaults to 600 (about 2px per candle).
+    - max_points (int, optional): Points to keep per line or marker trace. Defaults to 1500 (about one per pixel).
+    - detail_range (tuple, optional): (start, end) to keep at full resolution when it fits.
+
+    Returns:
+    - go.Figure: The same figure.
+    """
+    for trace in fig.data:
+        if trace.x is None:
+            continue
+        x = np.asarray(trace.x)
+        lo, hi = _detail_bounds(x, detail_range)
+        if isinstance(trace, go.Candlestick):
+            columns = [x] + [np.asarray(getattr(trace, col)) for col in ['open', 'high', 'low', 'close']]
+            parts = [
+                bucket_ohlc(*[col[start:end] for col in columns], budget)
+                for start, end, budget in _budgets(len(x), lo, hi, max_candles) if end > start
+            ]
+            trace.x, trace.open, trace.high, trace.low, trace.close = (np.concatenate(col) for col in zip(*parts))
+        elif isinstance(trace, (go.Scatter, go.Scattergl)) and trace.y is not None:
+            y = np.asarray(trace.y)
+            mode = trace.mode or 'lines'
+            if 'lines' in mode:
+                points = np.arange(len(x))
+            elif 'markers' in mode:
+                # a marker trace only has points where the indicator fired
+                points = np.flatnonzero(~pd.isna(y))
+                lo, hi = np.searchsorted(points, lo), np.searchsorted(points, hi)
+            else:
+                continue
+            px, py = x[points], y[points]
+            keep = np.concatenate([np.arange(0, dtype=np.int64)] + [
+                start + lttb(px[start:end], py[start:end], budget)
+                for start, end, budget in _budgets(len(points), lo, hi, max_points) if end > start
+            ])
+            trace.x, trace.y = px[keep], py[keep]
+    return fig
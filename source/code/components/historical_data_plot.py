@@ -2,13 +2,10 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
-import yfinance as yf
 from datetime import datetime, timedelta
 import pytz
-import ta
 import typing as t
 from source.tools.utils import save_ticker_args
-import source.code.yfinance_fetch as yfinance_fetch
 from source.code.settings import source_settings, Settings, SourceOptions
 import src.floor_ceiling_regime
 import source.code.indicators as sci
@@ -16,32 +13,93 @@ import strategy
 from time import sleep
 from requests.exceptions import HTTPError
 import uuid
+from source.code.components.downsample import downsample_figure
+from source.code.figure_cache import figure_cache, data_fingerprint
 
-def plot_historical_data(fig, data, chart_type, indicators):
+MAX_CANDLES = 600
+"""Candles sent per chart, about 2px each on a full-width chart."""
+MAX_POINTS = 1500
+"""Points sent per line or indicator trace, about one per pixel of a full-width chart."""
+RECENT_BARS = MAX_CANDLES
+"""Most recent bars drawn at full resolution when no range is selected."""
+
+def detail_range(data, zoom=None):
     """
-    @param data: The historical data to plot.
-    @param chart_type: The type of chart to plot. Either 'Candlestick' or 'Line'.
+    The range drawn at full resolution: the selected zoom range, or else the most recent bars.
     """
-    # Plot the stock price chart
-    x  = data['Datetime']
+    if zoom is not None:
+        return zoom
+    x = data['Datetime']
+    return x.iloc[max(0, len(x) - RECENT_BARS)], x.iloc[-1]
+
+
+def _layer(fig, data, zoom, downsample) -> dict:
+    """downsampled trace and layout dicts of a single-layer figure"""
+    if downsample:
+        downsample_figure(fig, max_candles=MAX_CANDLES, max_points=MAX_POINTS, detail_range=detail_range(data, zoom))
+    layout = fig.layout.to_plotly_json()
+    # every layer carries the default template; merging it again on each assembly is the slow part
+    layout.pop('template', None)
+    return {'traces': [trace.to_plotly_json() for trace in fig.data], 'layout': layout}
+
+
+def _price_layer(data, chart_type, zoom, downsample):
     if chart_type == 'Candlestick':
-        fig.add_trace(go.Candlestick(x=x,
-                                     open=data['open'],
-                                     high=data['high'],
-                                     low=data['low'],
-                                     close=data['close']))
+        fig = go.Figure(go.Candlestick(x=data['Datetime'],
+                                       open=data['open'],
+                                       high=data['high'],
+                                       low=data['low'],
+                                       close=data['close']))
     else:
         fig = px.line(data, x='Datetime', y='close')
+    return _layer(fig, data, zoom, downsample)
 
+
+def _indicator_layer(data, indicator, zoom, downsample):
+    fig = go.Figure()
     # indicator_data = sci.IndicatorManager.plot(fig, x, data, indicators)
-    indicator_data = strategy.IndicatorManager.plot(fig, x, data, indicators)
+    strategy.IndicatorManager.plot(fig, data['Datetime'], data, [indicator])
+    return _layer(fig, data, zoom, downsample)
+
+
+def plot_historical_data(fig, data, chart_type, indicators, zoom=None, downsample=True):
+    """
+    Indicators are computed on the full history; traces are then downsampled to what the chart can show,
+    keeping `detail_range(data, zoom)` at full resolution over a downsampled overview of the rest.
+
+    The price trace and each indicator are built as separate layers cached in `figure_cache` by data
+    fingerprint, so a rerun only builds the layers whose data, chart type or indicator changed.
+
+    @param data: The historical data to plot.
+    @param chart_type: The type of chart to plot. Either 'Candlestick' or 'Line'.
+    @param zoom: Optional (start, end) selected by the user; the x axis opens on it.
+    @param downsample: Set False to send every bar.
+    """
+    fingerprint = data_fingerprint(data)
+    zoom = None if zoom is None else tuple(zoom)
+    layers = [figure_cache.get_or_build(
+        (fingerprint, 'price', chart_type, zoom, downsample),
+        lambda: _price_layer(data, chart_type, zoom, downsample)
+    )]
+    # Trading Range Peak is drawn after the others, as IndicatorManager.plot does
+    for indicator in sorted(indicators, key=lambda name: name == 'Trading Range Peak'):
+        layers.append(figure_cache.get_or_build(
+            (fingerprint, indicator, zoom, downsample),
+            lambda: _indicator_layer(data, indicator, zoom, downsample)
+        ))
+    for layer in layers:
+        fig.add_traces(layer['traces'])
+        if layer['layout']:
+            fig.update_layout(layer['layout'])
+    # indicators compute on copies, so the indicator table is the price data itself
+    indicator_data = data
 
     fig.update_layout(title=f'Price Chart',
                       xaxis_title='Time',
                       yaxis_title='Price (USD)',
                       autosize=True,
                       height=800)
-    
-    
-    
-    return fig, indicator_data
\ No newline at end of file
+
+    if zoom is not None:
+        fig.update_xaxes(range=list(zoom))
+    return fig, indicator_data
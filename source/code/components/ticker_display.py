@@ -5,10 +5,14 @@ from source.code.settings import source_settings, SourceOptions
 from time import sleep
 from requests.exceptions import HTTPError
 import uuid
-from source.code.components.historical_data_plot import plot_historical_data
+from source.code.components.historical_data_plot import plot_historical_data, detail_range, MAX_CANDLES, MAX_POINTS
+from source.code.components.downsample import downsample_figure
 from strategy.indicators import Regime
 from source.code.settings_model import FetchSettings
 from plotly.subplots import make_subplots
+import pandas as pd
+
+LIVE_REFRESH_SECONDS = 30
 
 
 ##########################################################################################
@@ -35,8 +39,85 @@ def plot_volume(data, key):
         st.plotly_chart(volume_fig, use_container_width=True, key=f"volume_{key}")
 
 
-def display_ticker_data(data, symbol, chart_type, indicators, key, **kwargs):
+def append_bars(data, latest):
+    """
+    Merges freshly fetched bars into the displayed history, keeping its length.
+
+    The last displayed bar may still have been forming, so it is replaced by its fetched version.
+
+    Parameters:
+    - data (pd.DataFrame): The displayed history.
+    - latest (pd.DataFrame): The last few bars from the source.
+
+    Returns:
+    - tuple: The merged history and the number of bars that closed since the last merge.
+    """
+    last = data['Datetime'].iloc[-1]
+    fresh = latest[latest['Datetime'] >= last]
+    if fresh.empty:
+        return data, 0
+    merged = pd.concat([data[data['Datetime'] < last], fresh], ignore_index=True)
+    return merged.iloc[-len(data):].reset_index(drop=True), len(fresh) - 1
+
+
+def zoom_key(symbol):
+    return f'zoom_{symbol}'
+
+
+def in_tz(value, tz):
+    """
+    A timestamp in the time zone of the Datetime column (tz None for naive columns). Plotly draws and
+    selects tz-aware x values by their wall-clock time, so a naive value is read as wall-clock time in `tz`.
+    """
+    value = pd.Timestamp(value)
+    if value.tzinfo is None:
+        return value if tz is None else value.tz_localize(tz, ambiguous=True, nonexistent='shift_forward')
+    return value.tz_convert(tz) if tz is not None else value.tz_convert('UTC').tz_localize(None)
+
+
+def get_zoom(data, symbol):
+    """
+    The (start, end) range selected on the chart, in the time zone of `data`, or None. A range outside
+    the loaded history (e.g. after switching interval) is dropped.
+    """
+    zoom = st.session_state.get(zoom_key(symbol))
+    if zoom is None:
+        return None
+    # a range stored for another source's time zone (or before zones were kept) is converted here
+    zoom = tuple(in_tz(value, data['Datetime'].dt.tz) for value in zoom)
+    if zoom[1] < data['Datetime'].iloc[0] or zoom[0] > data['Datetime'].iloc[-1]:
+        del st.session_state[zoom_key(symbol)]
+        return None
+    st.session_state[zoom_key(symbol)] = zoom
+    return zoom
+
+
+def _store_zoom(chart_key, symbol, tz):
+    """on_select callback: a box selection on the price chart becomes the full-resolution range"""
+    event = st.session_state.get(chart_key)
+    boxes = event.selection.box if event is not None else []
+    if boxes and len(boxes[-1].get('x', [])) == 2:
+        st.session_state[zoom_key(symbol)] = tuple(sorted(in_tz(value, tz) for value in boxes[-1]['x']))
+
+
+def show_price_chart(fig, symbol, key, tz=None):
+    """price chart whose box selections load that range at full resolution; `tz` is the Datetime column's zone"""
+    st.plotly_chart(
+        fig, use_container_width=True, key=key,
+        on_select=lambda: _store_zoom(key, symbol, tz), selection_mode='box'
+    )
+    if st.session_state.get(zoom_key(symbol)) is not None:
+        st.button('Reset zoom', key=f'reset_zoom_{key}', on_click=lambda: st.session_state.pop(zoom_key(symbol), None))
+
+
+def display_price_panel(data, symbol, chart_type, indicators, key, fig=None):
+    """
+    Renders the metrics and price chart. Builds the figure (and its indicators) unless one is passed in.
+    A box selection on the chart reruns it with that range at full resolution.
 
+    Returns:
+    - tuple: The figure and the indicator data (None when the figure was passed in).
+    """
     last_close, change, pct_change, high, low, volume = calculate_metrics(data)
     
     st.markdown(f'# {symbol}')
@@ -49,6 +130,12 @@ def display_ticker_data(data, symbol, chart_type, indicators, key, **kwargs):
     col3.metric(label="End Date", value=end_date.strftime('%Y-%m-%d %H:%M'))
     col1, col2, col3 = st.columns(3)
 
+    indicator_data = None
+    if fig is not None:
+        show_price_chart(fig, symbol, key, data['Datetime'].dt.tz)
+        return fig, indicator_data
+    zoom = get_zoom(data, symbol)
+
     # fig = go.Figure()
     
     #fig, indicator_data = plot_historical_data(fig, data, chart_type, indicators)
@@ -91,7 +178,7 @@ def display_ticker_data(data, symbol, chart_type, indicators, key, **kwargs):
         # st.plotly_chart(fig, use_container_width=True, key=unique_key)
     else:
         # Display only the price chart if volume is not available
-        fig, indicator_data = plot_historical_data(go.Figure(), data, chart_type, indicators)
+        fig, indicator_data = plot_historical_data(go.Figure(), data, chart_type, indicators, zoom=zoom)
     
     
     
@@ -114,10 +201,60 @@ def display_ticker_data(data, symbol, chart_type, indicators, key, **kwargs):
     #         row=3, col=1
     #     )
 
-    st.plotly_chart(fig, use_container_width=True, key=key)
+    show_price_chart(fig, symbol, key, data['Datetime'].dt.tz)
     # Check if 'volume' column exists and plot it
     # if 'volume' in data.columns and any(data.volume > 0):
     #     plot_volume(data, key)
+    return fig, indicator_data
+
+
+def _update_price_trace(fig, data, chart_type, zoom):
+    """moves the forming bar of the price trace without recomputing indicators"""
+    trace = fig.data[0]
+    trace.x = data['Datetime']
+    if chart_type == 'Candlestick':
+        trace.open, trace.high, trace.low, trace.close = data['open'], data['high'], data['low'], data['close']
+    else:
+        trace.y = data['close']
+    # only the price trace is back at full length; the indicator traces are already within bounds
+    downsample_figure(fig, max_candles=MAX_CANDLES, max_points=MAX_POINTS, detail_range=detail_range(data, zoom))
+
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def live_price_panel(symbol, chart_type, indicators, key, state_key, fetch_latest):
+    """
+    Auto-refreshing fragment with the metrics and price chart. Only this fragment reruns: new bars are
+    merged into the history kept in session state, the figure is rebuilt (indicators included) only
+    when a bar has closed or the zoom range changed, and otherwise only the forming bar of the price trace is moved.
+    """
+    state = st.session_state[state_key]
+    data, closed = state['data'], 0
+    # the first run draws the history the page just loaded; later runs fetch
+    if state['fig'] is not None:
+        try:
+            data, closed = append_bars(data, fetch_latest())
+        except HTTPError as e:
+            st.warning(f"Live refresh failed: {e}")
+    zoom = get_zoom(data, symbol)
+    fig = state['fig'] if closed == 0 and zoom == state.get('zoom') else None
+    if fig is not None:
+        _update_price_trace(fig, data, chart_type, zoom)
+    state['zoom'] = zoom
+    state['fig'], indicator_data = display_price_panel(data, symbol, chart_type, indicators, key, fig=fig)
+    state['data'] = data
+    if indicator_data is not None:
+        state['indicator_data'] = indicator_data
+
+
+def display_ticker_data(data, symbol, chart_type, indicators, key, fetch_latest=None, **kwargs):
+    if kwargs.get('live_data', False) and fetch_latest is not None:
+        # full reruns restart the live view from the freshly loaded history
+        state_key = f'live_{symbol}'
+        st.session_state[state_key] = {'data': data, 'fig': None, 'indicator_data': None}
+        live_price_panel(symbol, chart_type, indicators, key, state_key, fetch_latest)
+        indicator_data = st.session_state[state_key]['indicator_data']
+    else:
+        _, indicator_data = display_price_panel(data, symbol, chart_type, indicators, key)
 
 
     
@@ -159,10 +296,6 @@ def display_ticker_data(data, symbol, chart_type, indicators, key, **kwargs):
 
     st.dataframe(indicator_data)
 
-    if kwargs.get('live_data', False):
-        sleep(30)
-        st.rerun()
-
 
 def format_float(value: float) -> str:
     """
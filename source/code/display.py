@@ -1,44 +1,92 @@
 from source.code.settings import SourceOptions
-from source.code.components.ticker_display import display_ticker_data as display_ticker_data_new
+from source.code.components.ticker_display import display_ticker_data as display_ticker_data_new, LIVE_REFRESH_SECONDS
 import streamlit as st
 import typing as t
 from source.code.settings import source_settings, SourceOptions
 from time import sleep
 from requests.exceptions import HTTPError
-import uuid
 from source.code.components.historical_data_plot import plot_historical_data
 from source.code.settings_model import FetchSettings
 from backend.models.custom import MyStock
-from backend.db_setup import SessionLocal
+from backend.db_setup import db_available, get_session
 import pandas as pd
 from source.code.settings import Interval
+from strategy.compact import maybe_compact
+from source.code.bar_cache import bar_cache
+from source.code.figure_cache import figure_cache
+from source.code.rate_limit import limited
 
-def display_ticker_data(source: SourceOptions, symbol, interval, chart_type, indicators, bar_count, **kwargs):
+LIVE_FETCH_BARS = 5
+"""Bars fetched on each live refresh; enough to close the forming bar and pick up new ones."""
+
+def refresh_ticker_data(source: SourceOptions, symbol, interval, bar_count, **kwargs):
+    """Drops the cached price history so the next `display_ticker_data` call refetches it."""
+    bar_cache.invalidate((source, symbol, interval, bar_count))
+
+
+def load_chart_data(source: SourceOptions, symbol, interval, bar_count):
+    """
+    Price history as the chart draws it: fetched through the bar cache (and the source's shared rate
+    limiter), merged with the database copy when it is reachable, and normalized. The cache warmer
+    calls this too, so a warmed chart has the same data fingerprint as the page's.
+
+    Raises:
+    - HTTPError: When the source request fails.
+    """
+    source_setting: FetchSettings = source_settings.get_setting(source)
+    data = bar_cache.get_or_fetch(
+        (source, symbol, interval, bar_count),
+        source_setting.get_setting(interval),
+        lambda: limited(source, lambda: source_setting.get_price_history(symbol, bar_count, interval))
+    )
+    # answered from the background health probe, so a down database never blocks the page
+    if db_available():
+        new_data = save_data(bar_count, symbol, interval, source)
+    else:
+        new_data = data
+    return normalize_data(pd.concat([new_data, data.iloc[[-1]]], ignore_index=True), source)
+
+
+def display_ticker_data(source: SourceOptions, symbol, interval, chart_type, indicators, bar_count, refresh=False, **kwargs):
     source_setting: FetchSettings = source_settings.get_setting(source)
+    if refresh:
+        refresh_ticker_data(source, symbol, interval, bar_count)
     try:
-        data = source_setting.get_price_history(symbol, bar_count, interval)
+        new_data = load_chart_data(source, symbol, interval, bar_count)
     except HTTPError as e:
         st.error(f"Error fetching data: {e}")
         return
+    cache_stats = bar_cache.stats()
+    st.sidebar.caption(f"Price cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses ({cache_stats['entries']} cached)")
+    chart_stats = figure_cache.stats()
+    st.sidebar.caption(f"Chart cache: {chart_stats['hits']} hits / {chart_stats['misses']} misses ({chart_stats['entries']} layers)")
 
-    if SessionLocal is not None:
-        new_data = save_data(bar_count, symbol, interval, source)
-    else:
-        new_data = data
-        
-    unique_id = str(uuid.uuid4())
-    key=f"{symbol}_{interval}_{unique_id}"
-    new_data = pd.concat([new_data, data.iloc[[-1]]], ignore_index=True)
-    if source == SourceOptions.CMC: 
-        new_data['Datetime'] = pd.to_datetime(new_data['Datetime'], utc=True).dt.tz_localize(None)
+    # stable across reruns so widget state (chart selection, notes) survives and unchanged charts are not remounted
+    key=f"{source}_{symbol}_{interval}"
 
+    def fetch_latest():
+        """last few bars for the live fragment, fetched at most once per refresh period across sessions"""
+        latest = bar_cache.get_or_fetch(
+            (source, symbol, interval, LIVE_FETCH_BARS),
+            source_setting.get_setting(interval),
+            lambda: limited(source, lambda: source_setting.get_price_history(symbol, LIVE_FETCH_BARS, interval)),
+            max_age=LIVE_REFRESH_SECONDS
+        )
+        return normalize_data(latest, source)
+
+    display_ticker_data_new(new_data, symbol, chart_type, indicators, key, fetch_latest=fetch_latest, **kwargs)
 
-    display_ticker_data_new(new_data, symbol, chart_type, indicators, key, **kwargs)
+
+def normalize_data(data, source):
+    data = maybe_compact(data)
+    if source == SourceOptions.CMC: 
+        data['Datetime'] = pd.to_datetime(data['Datetime'], utc=True).dt.tz_localize(None)
+    return data
 
 
 def save_data(bar_count, symbol, interval, source):
     # Add stock data to the database using MyStock.add_stock_data
-    with SessionLocal() as session:
+    with get_session() as session:
         # Create a MyStock instance (you may want to adjust attributes as needed)
         limit = bar_count
         stock = MyStock(
@@ -0,0 +1,100 @@
+"""
+Process-wide cache of built chart layers, so reruns with unchanged data do not rebuild traces.
+
+A price chart is assembled from layers: the price trace and one layer per indicator. Each layer is
+stored as plain trace and layout dicts (already downsampled) keyed by a fingerprint of the price
+data plus what the layer depends on, so toggling one indicator only builds that indicator's traces
+and a rerun with the same data, chart type and indicators builds nothing. Callers get a fresh figure
+assembled from the dicts, so mutating it (e.g. the live view moving the forming bar) never touches
+the cache.
+
+Classes:
+- FigureCache: LRU of built layers, with hit/miss counters.
+
+Functions:
+- data_fingerprint: Content hash of a price frame.
+
+Global Variables:
+- figure_cache: The shared instance used by `historical_data_plot.plot_historical_data`.
+"""
+
+import threading
+import typing as t
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from strategy.cache import ResultCache
+
+
+def data_fingerprint(data: pd.DataFrame) -> str:
+    """
+    Content hash of the bars a chart is drawn from: timestamps, OHLC and volume (read by the
+    ATR Volume Breakout layer).
+
+    Parameters:
+    - data (pd.DataFrame): Price history with Datetime, open, high, low, close and optionally volume columns.
+
+    Returns:
+    - str: Hex digest that changes whenever any bar does.
+    """
+    times = pd.to_datetime(data['Datetime']).astype('int64').to_numpy()
+    columns = [col for col in ['open', 'high', 'low', 'close', 'volume'] if col in data.columns]
+    return ResultCache.key('bars', [times] + [data[col].to_numpy() for col in columns], {'columns': columns})
+
+
+class FigureCache:
+    """
+    LRU of chart layers, each a dict with `traces` (list of trace dicts) and `layout` (layout dict).
+
+    Attributes:
+    - hits (int): Layers served from the cache.
+    - misses (int): Layers built.
+    - max_items (int): Layers kept before the least recently used are dropped.
+
+    Methods:
+    - get_or_build(key, build): Returns a cached layer or builds and stores one.
+    - clear(): Drops every layer.
+    - stats(): Counters and size, for display.
+    """
+    def __init__(self, max_items=128):
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self._entries: t.OrderedDict[tuple, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: tuple, build: t.Callable[[], dict]) -> dict:
+        """
+        Parameters:
+        - key (tuple): Data fingerprint plus everything the layer depends on.
+        - build (callable): Builds the layer on a miss.
+
+        Returns:
+        - dict: The layer; treat as read-only.
+        """
+        with self._lock:
+            layer = self._entries.get(key)
+            if layer is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return layer
+            self.misses += 1
+        layer = build()
+        with self._lock:
+            self._entries[key] = layer
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+        return layer
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+
+figure_cache = FigureCache()
+"""
+Shared instance used by `historical_data_plot.plot_historical_data`.
+"""
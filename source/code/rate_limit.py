@@ -0,0 +1,78 @@
+"""
+Process-wide request rate limits per data source.
+
+Page fetches, live refreshes and the background cache warmer all call the upstream APIs from the
+same server process; sharing one token bucket per source keeps their combined request rate under
+the provider's limit instead of each caller throttling (or not) on its own.
+
+Classes:
+- RateLimiter: Thread-safe token bucket.
+
+Functions:
+- limited(source, fetch): Calls `fetch` once the source's limiter allows it.
+
+Global Variables:
+- RATE_LIMITS: (requests per second, burst) per source.
+- rate_limiters: The shared limiter of each source.
+"""
+
+import threading
+import time
+import typing as t
+from source.code.settings import SourceOptions
+
+RATE_LIMITS = {
+    SourceOptions.COINBASE: (10, 10),
+    SourceOptions.YFINANCE: (2, 5),
+    SourceOptions.COINGECKO: (0.5, 5),
+    SourceOptions.CMC: (0.5, 5),
+}
+"""(requests per second, burst) per source, below each provider's documented or observed limit."""
+
+
+class RateLimiter:
+    """
+    Token bucket refilled at `rate` tokens per second, holding at most `burst`.
+
+    Methods:
+    - acquire(): Blocks until a token is available and takes it.
+    """
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+rate_limiters = {source: RateLimiter(rate, burst) for source, (rate, burst) in RATE_LIMITS.items()}
+"""
+Shared limiter of each source.
+"""
+
+
+def limited(source: str, fetch: t.Callable):
+    """
+    Parameters:
+    - source (str): A SourceOptions value; sources without a limit are not throttled.
+    - fetch (callable): The upstream call.
+
+    Returns:
+    - Any: What `fetch` returns.
+    """
+    limiter = rate_limiters.get(source)
+    if limiter is not None:
+        limiter.acquire()
+    return fetch()
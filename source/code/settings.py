@@ -9,6 +9,7 @@ Classes:
 Global Variables:
 - source_options: A list of available data sources.
 - source_settings: A dictionary mapping data sources to their respective FetchSettings.
+- YF_TZ, YF_OPEN, YF_CLOSE: Session time zone, open and close of the yfinance bars.
 
 Usage:
 - Use `source_settings` to configure and fetch data from supported sources.
@@ -18,10 +19,6 @@ Usage:
 from source.code.settings_model import FetchConfig, FetchSettings
 from datetime import timedelta
 from source.code.settings_model import Settings, SourceSettings
-import source.code.coinbase as cb_fetch
-import source.code.yfinance_fetch as yfinance_fetch
-import source.code.coingecko as cg_fetch
-import pycoinmarketcap
 from datetime import datetime, timedelta
 
 class Interval:
@@ -72,6 +69,13 @@ List of available data sources.
 """
 
 
+YF_TZ = 'America/New_York'
+YF_OPEN = timedelta(hours=9, minutes=30)
+YF_CLOSE = timedelta(hours=16)
+"""
+Session time zone, open and close of the yfinance bars, which set when cached bars expire.
+"""
+
 """
 Dictionary mapping data sources to their respective FetchSettings.
 
@@ -90,29 +94,30 @@ source_settings = SourceSettings({
             i.SIX_HOUR: FetchConfig('SIX_HOUR', timedelta(hours=6)),
             i.ONE_DAY: FetchConfig('ONE_DAY', timedelta(days=1)),
         }, 
-        get_price_history=cb_fetch.get_price_history
+        get_price_history='source.code.coinbase:get_price_history'
     ),
     SourceOptions.YFINANCE: FetchSettings(
         {
-            i.ONE_MINUTE: FetchConfig('1m', timedelta(minutes=1)),
+            # bars follow the US equity session: intraday bars from the 9:30 open, daily bars close at 16:00
+            i.ONE_MINUTE: FetchConfig('1m', timedelta(minutes=1), YF_OPEN, YF_TZ),
             # '2m': timedelta(minutes=2),
-            i.FIVE_MINUTE: FetchConfig('5m', timedelta(minutes=5)),
+            i.FIVE_MINUTE: FetchConfig('5m', timedelta(minutes=5), YF_OPEN, YF_TZ),
             # '10m': timedelta(minutes=10),
-            i.FIFTEEN_MINUTE: FetchConfig('15m', timedelta(minutes=15)),
-            i.THIRTY_MINUTE: FetchConfig('30m', timedelta(minutes=30)),
+            i.FIFTEEN_MINUTE: FetchConfig('15m', timedelta(minutes=15), YF_OPEN, YF_TZ),
+            i.THIRTY_MINUTE: FetchConfig('30m', timedelta(minutes=30), YF_OPEN, YF_TZ),
             # '60m': timedelta(hours=1),
-            i.ONE_HOUR: FetchConfig('1h', timedelta(hours=1)),
-            i.ONE_DAY: FetchConfig('1d', timedelta(days=1)),
-            i.FIVE_DAY: FetchConfig('5d', timedelta(days=5))
+            i.ONE_HOUR: FetchConfig('1h', timedelta(hours=1), YF_OPEN, YF_TZ),
+            i.ONE_DAY: FetchConfig('1d', timedelta(days=1), YF_CLOSE, YF_TZ),
+            i.FIVE_DAY: FetchConfig('5d', timedelta(days=5), YF_CLOSE, YF_TZ)
         },
-        get_price_history=yfinance_fetch.get_price_history
+        get_price_history='source.code.yfinance_fetch:get_price_history'
     ),
     SourceOptions.COINGECKO: FetchSettings(
         {
             i.ONE_DAY: FetchConfig('ONE_MINUTE', timedelta(days=1)),
             i.ONE_HOUR: FetchConfig('ONE_HOUR', timedelta(hours=1))
         }, 
-        get_price_history=cg_fetch.get_price_history,
+        get_price_history='source.code.coingecko:get_price_history',
         min_bars=1,
         max_bars=10000
     ),
@@ -121,7 +126,7 @@ source_settings = SourceSettings({
             i.ONE_HOUR: FetchConfig('hourly', timedelta(hours=1)),
             i.ONE_DAY: FetchConfig('daily', timedelta(days=1)),
         },
-        get_price_history=pycoinmarketcap.get_price_history,
+        get_price_history='pycoinmarketcap:get_price_history',
     )
 })
 
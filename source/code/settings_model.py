@@ -9,15 +9,49 @@ Classes:
 - FetchSettings: Extends Settings to include fetching logic and bar settings.
 - SourceSettings: Extends Settings to manage multiple data sources.
 
+Functions:
+- resolve(path): Imports a 'module:attribute' path, recording how long the import took.
+
+Global Variables:
+- import_times: Seconds spent importing each lazily loaded source module.
+
 Usage:
 - Use FetchArgs to define parameters for data fetching.
 - Use FetchSettings and SourceSettings to manage configurations for different data sources.
 """
 
 from datetime import datetime, timedelta
+import importlib
+import threading
+import time
 import typing as t
 from dataclasses import dataclass
 from abc import ABC
+from strategy.compact import maybe_compact
+from source.code.bar_cache import next_bar_close
+
+import_times: t.Dict[str, float] = {}
+"""
+Seconds spent importing each source module on first use, keyed by module path.
+"""
+
+
+def resolve(path: str):
+    """
+    Imports the attribute at `path` ('package.module:attribute').
+
+    Parameters:
+    - path (str): Import path of the attribute.
+
+    Returns:
+    - Any: The attribute.
+    """
+    module_path, _, attribute = path.partition(':')
+    start = time.perf_counter()
+    module = importlib.import_module(module_path)
+    if module_path not in import_times:
+        import_times[module_path] = time.perf_counter() - start
+    return getattr(module, attribute)
 
 @dataclass 
 class FetchArgs(dict):
@@ -86,12 +120,21 @@ class FetchConfig:
     Attributes:
     - interval (str): The time interval for data (e.g., '1 day').
     - timedelta (timedelta): The time delta corresponding to the interval.
+    - bar_anchor (timedelta): Offset of the source's bar boundaries from midnight (e.g. 16:00 for an
+      exchange's daily close). Defaults to 0.
+    - session_tz (str): Time zone the bar boundaries are set in. Defaults to 'UTC'.
 
     Methods:
     - get_start_time(bars): Calculates the start time based on the number of bars.
+    - next_close(now): Unix time at which the bar containing `now` closes.
     """
     interval: str
     timedelta: timedelta
+    bar_anchor: timedelta = timedelta(0)
+    session_tz: str = 'UTC'
+
+    def next_close(self, now=None) -> float:
+        return next_bar_close(self.timedelta, now, self.bar_anchor, self.session_tz)
 
     def get_start_time(self, bars: int):
         return datetime.now() - (bars * self.timedelta)
@@ -176,10 +219,14 @@ class FetchSettings(Settings):
     """
     Extends Settings to include fetching logic and bar settings.
 
+    The fetch function may be given as an import path ('package.module:function'), in which case the
+    source module (and the API client it creates) is only imported on the first fetch.
+
     Attributes:
     - _settings (dict): Dictionary of FetchConfig objects.
-    - _get_price_history (callable): Function to fetch price history.
+    - _get_price_history (callable | str): Function to fetch price history, or its import path.
     - _bar_settings (BarSettings): Bar settings for the data source.
+    - import_path (str): Module path of the source, or None when a function was given.
 
     Methods:
     - get_start_date(bars, interval): Calculates the start date for fetching data.
@@ -187,16 +234,30 @@ class FetchSettings(Settings):
     """
     _settings: t.Dict[str, FetchConfig]
 
-    def __init__(self, settings: t.Dict[str, FetchConfig], get_price_history: t.Callable, min_bars=100, max_bars=5000) -> None:
+    def __init__(self, settings: t.Dict[str, FetchConfig], get_price_history: t.Union[t.Callable, str], min_bars=100, max_bars=5000) -> None:
         super().__init__(settings)
         self._get_price_history = get_price_history
         self._bar_settings = BarSettings(min_bars, max_bars)
+        self._lock = threading.Lock()
+
+    @property
+    def import_path(self) -> t.Optional[str]:
+        if isinstance(self._get_price_history, str):
+            return self._get_price_history.partition(':')[0]
+        return None
+
+    def _fetch_function(self) -> t.Callable:
+        if isinstance(self._get_price_history, str):
+            with self._lock:
+                if isinstance(self._get_price_history, str):
+                    self._get_price_history = resolve(self._get_price_history)
+        return self._get_price_history
 
     def get_start_date(self, bars: int, interval: str):
         return self._settings[interval].get_start_time(bars)
     
     def get_price_history(self, symbol, bar_count, interval):
-        return self._get_price_history(symbol, bar_count, self.get_setting(interval))
+        return maybe_compact(self._fetch_function()(symbol, bar_count, self.get_setting(interval)))
 
 
 class SourceSettings(Settings):
@@ -15,12 +15,11 @@ Usage:
 
 import streamlit as st
 import source.code.display as display
-import source.code.yfinance_fetch as yfinance_fetch
 from source.code.settings import source_options, source_settings
 from source.code.indicators import IndicatorManager
 import pandas as pd
 from source.code.settings_model import FetchArgs
-from source.tools.utils import save_ticker_args
+from source.tools.utils import save_ticker_args, load_ticker_args
 
 def load_saved_args(page_name):
     """
@@ -33,7 +32,7 @@ def load_saved_args(page_name):
     - FetchArgs: The arguments for the specified page.
     """
     if 'ticker_args' not in st.session_state:
-        st.session_state.ticker_args = pd.read_pickle('ticker_args.pkl')
+        load_ticker_args()
     if page_name not in st.session_state.ticker_args:
         st.session_state.ticker_args[page_name] = {**FetchArgs(**{
             "symbol": page_name,
@@ -67,7 +66,7 @@ def create_sidebar(new_page_name: str):
     saved_fetch_args = load_saved_args(new_page_name)
     track_change = hof_track_change(st.session_state.ticker_args[new_page_name])
     fetch_args = new_search_form(st.sidebar, saved_fetch_args=saved_fetch_args, track_change=track_change)
-    save_ticker_args()
+    save_ticker_args(new_page_name)
     return fetch_args
 
 
@@ -136,8 +135,9 @@ def new_search_form(st_obj, saved_fetch_args, track_change):
         input_field=lambda x, y: st_obj.checkbox('Live Data', value=x, key=y), 
         key='live_data')
     
+    # the page renders the chart once with the stable key; the button only drops the cached history first
     if st_obj.button('Refresh'):
-        display.display_ticker_data(**fetch_args)
+        display.refresh_ticker_data(**fetch_args)
 
     return fetch_args
 
@@ -163,4 +163,6 @@ def coinbase_scan_form():
 
     with cols[0]:
         [track_change(fetch_key, input_field) for fetch_key, input_field in form]
+    # the scan page has no sidebar, so its settings are saved here
+    save_ticker_args('coinbase')
     return fetch_args, cols
\ No newline at end of file
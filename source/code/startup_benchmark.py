@@ -0,0 +1,164 @@
+"""
+Startup benchmark: import time of the app's entry modules and of each data source.
+
+Every module is imported in a fresh interpreter, so each measurement includes everything that
+module pulls in and nothing already imported by an earlier one. Time is the best of `repeat` runs.
+Source modules are listed from `source_settings`, which only imports them on first fetch; their
+times show what the first fetch of each source pays. A module that fails to import (e.g. a missing
+API key file) is reported with its error instead of a time.
+
+Each result also lists the source modules and source libraries (LAZY_MODULES) the import loaded.
+An entry module should load none of them: a page only pays for the sources it fetches from, so any
+listed for an entry module is a regression, reported by `--baseline` as well.
+
+At runtime, `settings_model.import_times` records the same cost for the sources a session actually
+loaded.
+
+Functions:
+- modules(): The modules measured.
+- lazy_modules(): Source modules and libraries entry modules must not import.
+- measure(module, repeat): Best import time of one module in a fresh interpreter, and the lazy modules it loaded.
+- run(repeat): Measures every module.
+- compare(results, baseline, tolerance): Modules that got slower than the baseline or that load lazy modules.
+
+Usage:
+    python -m source.code.startup_benchmark
+    python -m source.code.startup_benchmark --save-baseline
+    python -m source.code.startup_benchmark --baseline .benchmarks/startup_baseline.json   # exit 1 on regressions
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import typing as t
+from pathlib import Path
+
+ENTRY_MODULES = ['source.code.settings', 'source.code.display', 'source.code.sidebar']
+DEFAULT_OUTPUT = '.benchmarks/startup.json'
+DEFAULT_BASELINE = '.benchmarks/startup_baseline.json'
+SOURCE_LIBRARIES = ['yfinance', 'ta', 'coinbase', 'pycoingecko', 'pycoinmarketcap']
+"""Third-party libraries only the source modules need."""
+
+_SNIPPET = '''
+import json
+import sys
+import time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'loaded': [name for name in {watched!r} if name in sys.modules]}}))
+'''
+
+
+def _source_modules() -> t.List[str]:
+    from source.code.settings import source_settings
+    sources = [source_settings.get_setting(option).import_path for option in source_settings.options]
+    return [path for path in sources if path is not None]
+
+
+def modules() -> t.List[str]:
+    return ENTRY_MODULES + _source_modules()
+
+
+def lazy_modules() -> t.List[str]:
+    return _source_modules() + SOURCE_LIBRARIES
+
+
+def measure(module: str, repeat=3) -> dict:
+    """
+    Parameters:
+    - module (str): Dotted module path.
+    - repeat (int, optional): Fresh interpreters to time. Defaults to 3.
+
+    Returns:
+    - dict: {'module', 'seconds', 'loaded'} or {'module', 'error'}; `loaded` lists the lazy modules
+      (other than `module` itself) the import pulled in.
+    """
+    watched = [name for name in lazy_modules() if name != module]
+    times = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, '-c', _SNIPPET.format(module=module, watched=watched)], capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            lines = proc.stderr.strip().splitlines()
+            return {'module': module, 'error': lines[-1] if lines else f'exit code {proc.returncode}'}
+        res = json.loads(proc.stdout.strip().splitlines()[-1])
+        times.append(res['seconds'])
+    return {'module': module, 'seconds': min(times), 'loaded': res['loaded']}
+
+
+def run(repeat=3) -> t.List[dict]:
+    results = []
+    for module in modules():
+        res = measure(module, repeat)
+        results.append(res)
+        if 'error' in res:
+            print(f"{module}: failed ({res['error']})")
+        else:
+            loaded = f" (imports {', '.join(res['loaded'])})" if module in ENTRY_MODULES and res['loaded'] else ''
+            print(f"{module}: {res['seconds']:.3f}s{loaded}")
+    return results
+
+
+def compare(results, baseline, tolerance=0.25, min_seconds=0.05) -> t.List[dict]:
+    """
+    Modules whose import time grew by more than `tolerance` (as a fraction) over the baseline, and entry
+    modules that import a source module or library. Times under `min_seconds` in both runs are ignored
+    as noise.
+    """
+    previous = {res['module']: res.get('seconds') for res in baseline}
+    regressions = []
+    for res in results:
+        if res['module'] in ENTRY_MODULES and res.get('loaded'):
+            regressions.append({'module': res['module'], 'loaded': res['loaded']})
+        before, after = previous.get(res['module']), res.get('seconds')
+        if before is None or after is None or max(before, after) < min_seconds:
+            continue
+        if after > before * (1 + tolerance):
+            regressions.append({'module': res['module'], 'baseline': before, 'current': after, 'ratio': after / before})
+    return regressions
+
+
+def save(results, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2))
+
+
+def load(path) -> t.List[dict]:
+    return json.loads(Path(path).read_text())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure import time of the app and its data sources.')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', help='compare against this results file; exit 1 on regressions')
+    parser.add_argument('--save-baseline', action='store_true', help=f'also write the results to {DEFAULT_BASELINE}')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    save(results, args.output)
+    print(f'Results written to {args.output}')
+    if args.save_baseline:
+        save(results, DEFAULT_BASELINE)
+        print(f'Baseline written to {DEFAULT_BASELINE}')
+
+    if args.baseline:
+        regressions = compare(results, load(args.baseline), args.tolerance)
+        for reg in regressions:
+            if 'loaded' in reg:
+                print(f"REGRESSION {reg['module']} imports {', '.join(reg['loaded'])}")
+            else:
+                print(f"REGRESSION {reg['module']}: {reg['baseline']:.3f}s -> {reg['current']:.3f}s ({reg['ratio']:.2f}x)")
+        if regressions:
+            return 1
+        print('No regressions')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
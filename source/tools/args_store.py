@@ -0,0 +1,126 @@
+"""
+Persistent per-page fetch arguments in a small SQLite key-value store.
+
+Replaces pickling the whole `ticker_args` dict to `ticker_args.pkl` on every render. Each page's
+arguments are one row (page -> JSON). Saving compares against the last known value of that page
+and only queues pages that changed; queued pages are written together in one transaction once no
+change has arrived for `debounce` seconds, so dragging a slider costs one write, not one per
+rerun. The database runs in WAL mode, so readers never see a half-written transaction and
+concurrent sessions no longer race on a single pickle file.
+
+Reads are served from an in-process snapshot loaded once; sessions get their own copies. On first
+use, an existing `ticker_args.pkl` is imported into an empty store.
+
+Classes:
+- ArgsStore: The store.
+
+Global Variables:
+- args_store: The shared instance used by `utils.save_ticker_args` and `utils.load_ticker_args`.
+"""
+
+import atexit
+import json
+import pickle
+import sqlite3
+import threading
+import time
+import typing as t
+from contextlib import closing
+from pathlib import Path
+
+
+class ArgsStore:
+    """
+    Page -> fetch arguments, persisted in SQLite with debounced, diff-based writes.
+
+    Attributes:
+    - path (Path): SQLite database file.
+    - legacy_path (Path): Pickle imported into an empty store.
+    - debounce (float): Seconds without changes before pending pages are written.
+
+    Methods:
+    - load_all(): Copy of every page's arguments.
+    - save(page, args): Queues the page if its arguments changed.
+    - flush(): Writes queued pages now.
+    """
+    def __init__(self, path='ticker_args.db', legacy_path='ticker_args.pkl', debounce=1.0):
+        self.path = Path(path)
+        self.legacy_path = Path(legacy_path)
+        self.debounce = debounce
+        self._lock = threading.Lock()
+        self._snapshot: t.Optional[t.Dict[str, str]] = None
+        self._pending: t.Dict[str, str] = {}
+        self._timer: t.Optional[threading.Timer] = None
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=5)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS ticker_args (page TEXT PRIMARY KEY, args TEXT NOT NULL, updated_at REAL NOT NULL)'
+        )
+        return connection
+
+    def _load(self) -> t.Dict[str, str]:
+        """page -> JSON text, read once per process"""
+        if self._snapshot is None:
+            with closing(self._connect()) as connection:
+                rows = dict(connection.execute('SELECT page, args FROM ticker_args').fetchall())
+            if not rows and self.legacy_path.exists():
+                with open(self.legacy_path, 'rb') as f:
+                    legacy = pickle.load(f)
+                rows = {page: json.dumps(dict(args), sort_keys=True) for page, args in legacy.items()}
+                self._write(rows)
+                print(f'ArgsStore: imported {len(rows)} pages from {self.legacy_path}')
+            self._snapshot = rows
+        return self._snapshot
+
+    def load_all(self) -> t.Dict[str, dict]:
+        with self._lock:
+            return {page: json.loads(args) for page, args in self._load().items()}
+
+    def save(self, page: str, args: dict):
+        """
+        Parameters:
+        - page (str): Page name.
+        - args (dict): The page's fetch arguments (JSON-serializable).
+        """
+        text = json.dumps(dict(args), sort_keys=True)
+        with self._lock:
+            snapshot = self._load()
+            if snapshot.get(page) == text:
+                return
+            snapshot[page] = text
+            self._pending[page] = text
+            # restart the quiet period; the write happens once changes stop
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._timer = None
+        if pending:
+            self._write(pending)
+
+    def _write(self, rows: t.Dict[str, str]):
+        try:
+            # one transaction: either every queued page is stored or none is
+            with closing(self._connect()) as connection, connection:
+                now = time.time()
+                connection.executemany(
+                    'INSERT INTO ticker_args (page, args, updated_at) VALUES (?, ?, ?) '
+                    'ON CONFLICT(page) DO UPDATE SET args = excluded.args, updated_at = excluded.updated_at',
+                    [(page, args, now) for page, args in rows.items()]
+                )
+        except sqlite3.Error as e:
+            print(f'ArgsStore: could not write {sorted(rows)}: {e}')
+
+
+args_store = ArgsStore()
+"""
+Shared instance used by `utils.save_ticker_args` and `utils.load_ticker_args`.
+"""
+atexit.register(args_store.flush)
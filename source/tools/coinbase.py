@@ -15,6 +15,8 @@ import multiprocessing
 import warnings
 from source.code.display import plot_historical_data
 import numpy as np
+import strategy.panel as panel
+from strategy.compact import maybe_compact
 
 warnings.simplefilter(action='ignore', category=FutureWarning)
 # Warning-causing lines of code here
@@ -86,8 +88,10 @@ def scan(symbols, interval, bar_count, **_):
     range_values = pd.DataFrame(columns=['symbol', 'tr_signal'])
     largest_table = pd.DataFrame()
     coinbase_settings = source_settings.get('coinbase')
+    frames = {}
     for i, symbol in enumerate(symbols):
         data = coinbase_settings.get_price_history(symbol, bar_count, interval)
+        frames[symbol] = data
         largest_table = data if len(data) > len(largest_table) else largest_table
         tables = regime_scanner(data, symbol)
         if tables is not None:
@@ -97,7 +101,12 @@ def scan(symbols, interval, bar_count, **_):
             res = trading_range.update(data, tables.peak_table)
             range_values.loc[len(range_values)] = {'symbol': symbol, 'tr_signal': res['tr_signal'].iloc[-2]}
 
-    regime_table = pd.concat(regimes).reset_index(drop=True)
+    # rolling trading range for every symbol in one vectorized pass over the aligned panel
+    price_panel = panel.Panel.from_frames(frames)
+    rolling_signal = panel.trading_range_signal(price_panel.close, panel.trading_range(price_panel.close))
+    range_values['rolling_tr_signal'] = range_values.symbol.map(price_panel.last(rolling_signal, offset=2))
+
+    regime_table = maybe_compact(pd.concat(regimes).reset_index(drop=True))
 
     # express the start and end columns in datetime for readability
     regime_table.start = largest_table.loc[regime_table.start, 'Datetime'].values
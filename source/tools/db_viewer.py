@@ -2,20 +2,20 @@ import streamlit as st
 import source.code.display as display
 import source.code.sidebar as sidebar
 import pandas as pd
-from sqlalchemy.orm import sessionmaker
-from backend.db_setup import engine
+from backend.db_setup import db_available, check_health, get_session
 from backend.models.models import Stock
 
 
-
-# Create a session factory
-Session = sessionmaker(bind=engine)
-
 # Streamlit app to display Stock table
 st.title("Stock Table Viewer")
 
+# this page needs the database, so wait for one short probe rather than only reading the background result
+if not (db_available() or check_health()):
+    st.warning("Database unavailable; the stock table cannot be shown.")
+    st.stop()
+
 # Fetch data from the Stock table
-with Session() as session:
+with get_session() as session:
     query = session.query(Stock).all()
     data = [
         {
@@ -3,18 +3,20 @@ import streamlit as st
 from pathlib import Path
 import pandas as pd
 import os
-import uuid
-
-def save_ticker_args():
-    with open("ticker_args.pkl", "wb") as f:
-        pickle.dump(st.session_state.ticker_args, f)
+import hashlib
+from collections import OrderedDict
+import numpy as np
+from source.tools.args_store import args_store
+
+def save_ticker_args(page_name=None):
+    """Persists one page's fetch args (or every page's); unchanged pages are not written."""
+    ticker_args = st.session_state.ticker_args
+    pages = list(ticker_args) if page_name is None else [page_name]
+    for page in pages:
+        args_store.save(page, ticker_args[page])
 
 def load_ticker_args():
-    if Path("ticker_args.pkl").exists():
-        with open("ticker_args.pkl", "rb") as f:
-            st.session_state.ticker_args = pickle.load(f)
-    else:
-        st.session_state.ticker_args = dict()
+    st.session_state.ticker_args = args_store.load_all()
 
 def load_config(path):
     return pd.read_pickle(path)
@@ -63,6 +65,105 @@ def column_filter_config(col_config, config_pkl_path, key, table_height=800):
     return col_config
 
 
+_VIEW_CACHE_ITEMS = 16
+PAGE_SIZES = [100, 250, 500, 1000]
+_gradient_cache = OrderedDict()
+_query_cache = OrderedDict()
+
+
+def _remember(cache, key, value):
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > _VIEW_CACHE_ITEMS:
+        cache.popitem(last=False)
+    return value
+
+
+def dataset_version(df: pd.DataFrame) -> str:
+    """Content hash of a table; styling and query results are cached under it."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(df.columns)).encode())
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=True)
+    except TypeError:
+        # unhashable cells (e.g. the list-valued top_3_coins of the CoinGecko categories) are hashed as text
+        row_hashes = pd.util.hash_pandas_object(df.apply(lambda col: col.astype(str) if col.dtype == object else col), index=True)
+    digest.update(row_hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _gradient_css(values: pd.Series, cmap) -> pd.Series:
+    """viridis background and contrasting text per cell, as `Styler.background_gradient` renders them"""
+    values = values.astype(float)
+    low, high = values.min(), values.max()
+    norm = ((values - low) / (high - low) if high > low else values * 0).to_numpy()
+    rgba = cmap(np.nan_to_num(norm, nan=0.0))
+    # missing values render black, as in pandas
+    rgba[np.isnan(norm)] = [0.0, 0.0, 0.0, 1.0]
+    # relative luminance, dark text on light backgrounds (same 0.408 threshold as pandas)
+    linear = np.where(rgba[:, :3] <= 0.04045, rgba[:, :3] / 12.92, ((rgba[:, :3] + 0.055) / 1.055) ** 2.4)
+    luminance = linear @ np.array([0.2126, 0.7152, 0.0722])
+    channels = (rgba[:, :3] * 255).round().astype(int)
+    css = [
+        f'background-color: #{r:02x}{g:02x}{b:02x}; color: {"#f1f1f1" if lum < 0.408 else "#000000"}'
+        for (r, g, b), lum in zip(channels, luminance)
+    ]
+    return pd.Series(css, index=values.index)
+
+
+def gradient_styles(df: pd.DataFrame, version: str) -> pd.DataFrame:
+    """
+    CSS for every float cell of `df` (empty for other columns), computed once per dataset version.
+
+    Parameters:
+    - df (pd.DataFrame): The full table.
+    - version (str): `dataset_version(df)`.
+
+    Returns:
+    - pd.DataFrame: CSS strings, positionally aligned with `df`.
+    """
+    if version in _gradient_cache:
+        _gradient_cache.move_to_end(version)
+        return _gradient_cache[version]
+    from matplotlib import colormaps
+    cmap = colormaps['viridis']
+    styles = pd.DataFrame('', index=df.index, columns=df.columns)
+    for column in df.select_dtypes(include=['float']).columns:
+        styles[column] = _gradient_css(df[column], cmap)
+    return _remember(_gradient_cache, version, styles)
+
+
+def query_rows(df: pd.DataFrame, version: str, query: str) -> np.ndarray:
+    """
+    Row positions matching `query` (all rows when empty), memoized per dataset version and query.
+    Raises whatever `DataFrame.query` raises for an invalid query.
+    """
+    if not query:
+        return np.arange(len(df))
+    key = (version, query)
+    if key in _query_cache:
+        _query_cache.move_to_end(key)
+        return _query_cache[key]
+    matched = df.reset_index(drop=True).query(query).index.to_numpy()
+    return _remember(_query_cache, key, matched)
+
+
+def page_rows(rows: np.ndarray, key: str) -> np.ndarray:
+    """Renders page controls and returns the row positions of the selected page."""
+    col1, col2, col3 = st.columns([1, 1, 4])
+    with col1:
+        page_size = st.selectbox('Rows per page', PAGE_SIZES, key=f'{key}_page_size')
+    pages = max(1, -(-len(rows) // page_size))
+    with col2:
+        # no max_value: a page left over from a longer result is clamped below instead of rejected
+        page = st.number_input('Page', min_value=1, value=1, key=f'{key}_page')
+    start = (min(page, pages) - 1) * page_size
+    with col3:
+        st.caption(f'Rows {min(start + 1, len(rows))}-{min(start + page_size, len(rows))} of {len(rows)}')
+    return rows[start:start + page_size]
+
+
+
 def products_viewer(config_pkl_path, load_data, key, use_container_width=False, name=''):
     table_height = 800
     products = load_data()
@@ -105,34 +206,35 @@ def products_viewer(config_pkl_path, load_data, key, use_container_width=False,
 
         
         with col2:
-            filtered_products = query_call(products, query)
+            version = dataset_version(products)
+            try:
+                rows = query_rows(products, version, query)
+            except Exception as e:
+                st.error(f"Query failed: {e}")
+                rows = np.arange(len(products))
             visible_columns = edited_columns_config.columns[edited_columns_config.loc['Show']].tolist()
+            rows = page_rows(rows, key)
 
-            filtered_products = filtered_products[visible_columns]
-
-            # Apply gradient styling to float columns
-            float_columns = filtered_products.select_dtypes(include=['float']).columns
-            
+            page = products.iloc[rows][visible_columns]
 
-            # format floats to show comma
-            
+            # gradient colors are computed once per dataset version, then sliced to the page
+            float_columns = page.select_dtypes(include=['float']).columns
+            styles = gradient_styles(products, version).iloc[rows].reindex(columns=page.columns, fill_value='')
+            styles.index = page.index
 
             kwargs = dict()
-            if 'url' in filtered_products.columns:
+            if 'url' in page.columns:
                 kwargs['column_config'] = {
                     'url': st.column_config.LinkColumn(display_text='Link', width='small')
                 }
-                kwargs['column_order'] = ['url'] + [col for col in filtered_products.columns if col != 'url']
-            # Generate a unique identifier for the session
-            session_id = uuid.uuid4()
-            st.session_state['session_id'] = session_id
-            filtered_products['Show'] = False
-            styled_df = filtered_products.style.background_gradient(subset=float_columns, cmap='viridis')
+                kwargs['column_order'] = ['url'] + [col for col in page.columns if col != 'url']
+            page = page.assign(Show=False)
+            styled_df = page.style.apply(lambda _: styles.reindex(columns=page.columns, fill_value=''), axis=None)
             styled_df = styled_df.format(precision=4, thousands=",")
             st.data_editor(
                 styled_df, 
                 height=table_height, 
-                key=str(session_id), 
+                key=f'{key}_editor', 
                 use_container_width=use_container_width,
                 **kwargs
             )
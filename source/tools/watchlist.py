@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 import uuid
 import typing as t
+from source.code.cache_warmer import OWNER_HEARTBEAT, cache_warmer, watchlist_targets
+from source.tools.args_store import args_store
 
 # Initialize session state for watchlist if not already done
 if 'watchlist' not in st.session_state:
@@ -145,3 +147,26 @@ if st.session_state.watchlist:
     st.subheader("Watchlist DataFrame")
     df = pd.DataFrame(st.session_state.watchlist)
     st.dataframe(df, use_container_width=True)
+
+
+# Keep this session's watchlist warm in the background (price history, indicators and chart layers)
+if 'watchlist_owner' not in st.session_state:
+    st.session_state.watchlist_owner = str(uuid.uuid4())
+
+
+@st.fragment(run_every=OWNER_HEARTBEAT)
+def cache_warmer_panel():
+    """re-registers the watchlist while the page is open, so the warmer keeps this session's targets"""
+    cache_warmer.sync(st.session_state.watchlist_owner, watchlist_targets(st.session_state.watchlist, args_store.load_all()))
+
+    st.subheader("Cache Warmer")
+    warm_status = pd.DataFrame(cache_warmer.status())
+    if warm_status.empty:
+        st.caption("No complete watchlist entries to keep warm.")
+    else:
+        if 'warmed_at' in warm_status.columns:
+            warm_status['warmed_at'] = pd.to_datetime(warm_status['warmed_at'], unit='s')
+        st.dataframe(warm_status, use_container_width=True)
+
+
+cache_warmer_panel()
@@ -0,0 +1,400 @@
+"""
+Benchmark suite for the strategy package.
+
+Times and memory-profiles each indicator, strategy update and Stats metric on synthetic OHLCV data
+of increasing length, writes the results as JSON and compares them against a saved baseline.
+
+Panel cases (panel indicators, portfolio signals and backtest) run on PANEL_SYMBOLS symbols built
+from the generated series, so `bars` is the length of each symbol's history. The parameter sweep
+runs in a process pool; its memory figure only covers the parent process.
+
+Time and memory are measured in separate runs, since tracemalloc slows the code it traces. Time is
+the best of `repeat` runs; memory is the tracemalloc peak of one run (numpy and pandas allocations
+included). The indicator result cache is bypassed so every run does the full computation.
+
+Generators:
+- random_walk: Geometric random walk.
+- regime_switching: Markov-switching drift and volatility, the kind of series Regime is built for.
+- gap_heavy: Random walk with frequent opening gaps, stressing true range and range indicators.
+
+Usage:
+    python -m strategy.benchmark --sizes 1e3 1e5 --output .benchmarks/latest.json
+    python -m strategy.benchmark --save-baseline            # record .benchmarks/baseline.json
+    python -m strategy.benchmark --baseline .benchmarks/baseline.json   # exit 1 on regressions
+    python -m strategy.benchmark --sizes 5e4 --generators random_walk --only panel portfolio   # 500 symbols x 50k bars
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import typing as t
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+DEFAULT_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+DEFAULT_OUTPUT = '.benchmarks/latest.json'
+DEFAULT_BASELINE = '.benchmarks/baseline.json'
+PANEL_SYMBOLS = 500
+PANEL_MAX_BARS = 5 * 10 ** 4
+
+
+def _ohlcv(close, rng, gap=None) -> pd.DataFrame:
+    """builds open/high/low/volume around a close path; `gap` is the log jump between close and next open"""
+    n = len(close)
+    prev_close = np.concatenate(([close[0]], close[:-1]))
+    open_ = prev_close if gap is None else prev_close * np.exp(gap)
+    spread = np.abs(rng.normal(0, 0.004, n)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.lognormal(10, 1, n)
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume})
+
+
+def random_walk(n: int, seed=0) -> pd.DataFrame:
+    """Geometric random walk with 1% bar volatility."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return _ohlcv(close, rng)
+
+
+def regime_switching(n: int, seed=0, mean_duration=500) -> pd.DataFrame:
+    """Trends up, trends down and chops, switching state every `mean_duration` bars on average."""
+    rng = np.random.default_rng(seed)
+    drift = np.array([0.0008, -0.0008, 0.0])
+    vol = np.array([0.008, 0.012, 0.005])
+    switches = rng.random(n) < 1 / mean_duration
+    state = (np.cumsum(switches) + rng.integers(0, 3)) % 3
+    close = 100 * np.exp(np.cumsum(rng.normal(drift[state], vol[state])))
+    return _ohlcv(close, rng)
+
+
+def gap_heavy(n: int, seed=0, gap_prob=0.1) -> pd.DataFrame:
+    """Random walk where `gap_prob` of bars open with a 2-8% gap from the previous close."""
+    rng = np.random.default_rng(seed)
+    gap = np.where(rng.random(n) < gap_prob, rng.choice([-1, 1], n) * rng.uniform(0.02, 0.08, n), 0.0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n) + gap))
+    return _ohlcv(close, rng, gap=gap)
+
+
+GENERATORS = {
+    'random_walk': random_walk,
+    'regime_switching': regime_switching,
+    'gap_heavy': gap_heavy,
+}
+
+
+@dataclass
+class Case:
+    """
+    Attributes:
+    - name (str): Result label, `group.name`.
+    - setup (callable): Builds the object to run from the price frame; not timed.
+    - run (callable): The timed call, given the setup result and the price frame.
+    - max_bars (int): Largest size this case is run at, to keep slow cases bounded.
+    """
+    name: str
+    setup: t.Callable
+    run: t.Callable
+    max_bars: int = 10 ** 7
+
+
+def _stats(price):
+    from .strategies import XOverStrat
+    from .logic.stats import Stats
+    strategy = XOverStrat(slow=200, fast=50)
+    strategy.update(price)
+    return Stats(strategy)
+
+
+def _regime_peak_table(price):
+    from .indicators import Regime
+    regime = Regime()
+    regime.update(price)
+    return regime.value.peak_table
+
+
+def _panel(price, symbols=PANEL_SYMBOLS, seed=0):
+    """
+    (symbols x bars) panel whose rows reshuffle the bars of `price`, so every symbol has the generator's
+    return and range distribution. Histories start at staggered bars and miss 0.1% of bars, like a
+    scanner panel of exchange listings.
+    """
+    from .panel import Panel
+    rng = np.random.default_rng(seed)
+    n = len(price)
+    close = price.close.to_numpy()
+    log_ret = np.diff(np.log(close), prepend=np.log(close[0]))
+    high_ratio, low_ratio = price.high.to_numpy() / close, price.low.to_numpy() / close
+    volume = price.volume.to_numpy()
+    arrays = {name: np.empty((symbols, n)) for name in ['close', 'high', 'low', 'volume']}
+    for row in range(symbols):
+        order = rng.permutation(n)
+        row_close = 100 * np.exp(np.cumsum(log_ret[order]))
+        arrays['close'][row] = row_close
+        arrays['high'][row] = row_close * high_ratio[order]
+        arrays['low'][row] = row_close * low_ratio[order]
+        arrays['volume'][row] = volume[order]
+    missing = rng.random((symbols, n)) < 0.001
+    missing |= np.arange(n) < rng.integers(0, max(n // 10, 1), symbols)[:, None]
+    for values in arrays.values():
+        values[missing] = np.nan
+    return Panel([f'S{row}' for row in range(symbols)], pd.RangeIndex(n), **arrays)
+
+
+def _panel_with_signal(price):
+    """panel plus a trend signal (close vs its 120-bar mean), flat where undefined"""
+    from .panel import move_avg
+    panel = _panel(price)
+    signal = np.nan_to_num(np.sign(panel.close - move_avg(panel.close, 120)))
+    return panel, signal
+
+
+def cases() -> t.List[Case]:
+    """every benchmark case; imports are deferred so `--help` works without the package's dependencies"""
+    from . import indicators as ind
+    from . import strategies as strat
+    from . import panel as pnl
+    from . import portfolio
+    from .sweep import sweep
+
+    def update(name, factory, max_bars=10 ** 7):
+        return Case(name, lambda price: factory(), lambda obj, price: obj.update(price), max_bars)
+
+    def metric(name, call, max_bars=10 ** 7):
+        return Case(f'stats.{name}', _stats, lambda stats, price: call(stats), max_bars)
+
+    return [
+        update('indicator.MoveAvg', lambda: ind.MoveAvg(120)),
+        update('indicator.BollingerBand', lambda: ind.BollingerBand(20, 2)),
+        update('indicator.TradingRange', lambda: ind.TradingRange(.40, .61, 200)),
+        update('indicator.ATRVolumeBreakout', lambda: ind.ATRVolumeBreakout()),
+        update('indicator.Regime', lambda: ind.Regime(), max_bars=10 ** 5),
+        Case(
+            'indicator.TradingRangePeak',
+            lambda price: ind.TradingRangePeak(_regime_peak_table(price), peak_window=3),
+            lambda obj, price: obj.update(price),
+            max_bars=10 ** 5,
+        ),
+        update('strategy.XOverStrat', lambda: strat.XOverStrat(slow=200, fast=50)),
+        update('strategy.BollingerMeanReversion', lambda: strat.BollingerMeanReversion(20, 2)),
+        update('strategy.TradingRangeBreakout', lambda: strat.TradingRangeBreakout(.40, .61, 200)),
+        metric('sharpe', lambda s: s.sharpe()),
+        metric('grit', lambda s: s.grit()),
+        metric('profit_ratio', lambda s: s.profit_ratio()),
+        metric('tail_ratio', lambda s: s.tail_ratio(), max_bars=10 ** 6),
+        metric('win_rate', lambda s: s.win_rate()),
+        metric('robustness_score', lambda s: s.robustness_score(), max_bars=10 ** 6),
+        metric('report', lambda s: s.report(), max_bars=10 ** 6),
+        Case(
+            'panel.trading_range',
+            _panel,
+            lambda panel, price: pnl.trading_range_signal(panel.close, pnl.trading_range(panel.close)),
+            max_bars=PANEL_MAX_BARS,
+        ),
+        Case(
+            'panel.atr_volume_breakout',
+            _panel,
+            lambda panel, price: pnl.atr_volume_breakout(panel.high, panel.low, panel.close, panel.volume),
+            max_bars=PANEL_MAX_BARS,
+        ),
+        Case(
+            'portfolio.signal_panel',
+            _panel,
+            lambda panel, price: portfolio.signal_panel(lambda: strat.XOverStrat(slow=200, fast=50), panel),
+            max_bars=PANEL_MAX_BARS,
+        ),
+        Case(
+            'portfolio.backtest',
+            _panel_with_signal,
+            lambda obj, price: portfolio.backtest(*obj, cost=0.001),
+            max_bars=PANEL_MAX_BARS,
+        ),
+        Case(
+            'sweep.XOverStrat',
+            lambda price: None,
+            lambda obj, price: sweep(strat.XOverStrat, {'slow': [100, 200, 300], 'fast': [10, 20, 50]}, price),
+            max_bars=10 ** 6,
+        ),
+    ]
+
+
+class _NoCache:
+    """stands in for the indicator result cache so benchmarks always compute"""
+    @staticmethod
+    def get_or_compute(name, arrays, params, compute):
+        return compute()
+
+
+@contextlib.contextmanager
+def _uncached():
+    from . import indicators
+    cache = indicators.result_cache
+    indicators.result_cache = _NoCache()
+    try:
+        yield
+    finally:
+        indicators.result_cache = cache
+
+
+def _measure(case: Case, price: pd.DataFrame, repeat: int) -> dict:
+    seconds = []
+    for _ in range(repeat):
+        obj = case.setup(price)
+        gc.collect()
+        start = time.perf_counter()
+        case.run(obj, price)
+        seconds.append(time.perf_counter() - start)
+
+    obj = case.setup(price)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        case.run(obj, price)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'seconds': min(seconds), 'peak_mb': peak / 2 ** 20}
+
+
+def run(sizes=None, generators=None, only=None, repeat=3, seed=0) -> dict:
+    """
+    Runs every case on every generator and size.
+
+    Parameters:
+    - sizes (list[int], optional): Bar counts. Defaults to 1e3 through 1e7.
+    - generators (list[str], optional): Names from GENERATORS. Defaults to all.
+    - only (list[str], optional): Substrings; only cases whose name contains one are run.
+    - repeat (int, optional): Timed runs per measurement (best is kept). Runs over 1e6 bars are timed once.
+    - seed (int, optional): Seed of the synthetic data.
+
+    Returns:
+    - dict: 'meta' (versions, platform, time) and 'results' (one row per case, generator and size).
+    """
+    sizes = sizes or DEFAULT_SIZES
+    generators = generators or list(GENERATORS)
+    selected = [case for case in cases() if not only or any(name in case.name for name in only)]
+    results = []
+    with _uncached():
+        for size in sizes:
+            for gen_name in generators:
+                price = GENERATORS[gen_name](size, seed)
+                for case in selected:
+                    row = {'case': case.name, 'generator': gen_name, 'bars': size}
+                    if size > case.max_bars:
+                        continue
+                    try:
+                        row.update(_measure(case, price, repeat if size <= 10 ** 6 else 1))
+                    except Exception as e:
+                        row['error'] = f'{type(e).__name__}: {e}'
+                    print(_format_row(row))
+                    results.append(row)
+    return {
+        'meta': {
+            'time': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def _format_row(row) -> str:
+    label = f"{row['case']:<36} {row['generator']:<17} {row['bars']:>9}"
+    if 'error' in row:
+        return f"{label}  ERROR {row['error']}"
+    return f"{label}  {row['seconds']:>9.4f}s  {row['peak_mb']:>9.1f}MB"
+
+
+def _key(row):
+    return row['case'], row['generator'], row['bars']
+
+
+def compare(results: dict, baseline: dict, tolerance=0.25, min_seconds=0.005) -> t.List[dict]:
+    """
+    Finds measurements that got slower or bigger than the baseline by more than `tolerance`.
+
+    Parameters:
+    - results (dict): Output of `run`.
+    - baseline (dict): A previous output of `run`.
+    - tolerance (float, optional): Allowed relative increase. Defaults to 0.25 (25%).
+    - min_seconds (float, optional): Timings below this in the baseline are too noisy to compare. Defaults to 5ms.
+
+    Returns:
+    - list[dict]: One row per regression with the metric, baseline and current values.
+    """
+    previous = {_key(row): row for row in baseline.get('results', []) if 'error' not in row}
+    regressions = []
+    for row in results['results']:
+        before = previous.get(_key(row))
+        if before is None or 'error' in row:
+            continue
+        for metric in ['seconds', 'peak_mb']:
+            if metric == 'seconds' and before[metric] < min_seconds:
+                continue
+            if row[metric] > before[metric] * (1 + tolerance):
+                regressions.append({
+                    'case': row['case'], 'generator': row['generator'], 'bars': row['bars'],
+                    'metric': metric, 'baseline': before[metric], 'current': row[metric],
+                    'ratio': row[metric] / before[metric] if before[metric] else float('inf'),
+                })
+    return regressions
+
+
+def save(results: dict, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2))
+
+
+def load(path) -> dict:
+    return json.loads(Path(path).read_text())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the strategy package on synthetic OHLCV data.')
+    parser.add_argument('--sizes', nargs='+', type=float, default=DEFAULT_SIZES, help='bar counts, e.g. 1e3 1e5')
+    parser.add_argument('--generators', nargs='+', choices=list(GENERATORS), default=list(GENERATORS))
+    parser.add_argument('--only', nargs='+', help='run only cases whose name contains one of these')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', help='compare against this results file; exit 1 on regressions')
+    parser.add_argument('--save-baseline', action='store_true', help=f'also write the results to {DEFAULT_BASELINE}')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run([int(size) for size in args.sizes], args.generators, args.only, args.repeat, args.seed)
+    save(results, args.output)
+    print(f'Results written to {args.output}')
+    if args.save_baseline:
+        save(results, DEFAULT_BASELINE)
+        print(f'Baseline written to {DEFAULT_BASELINE}')
+
+    if args.baseline:
+        regressions = compare(results, load(args.baseline), args.tolerance)
+        for reg in regressions:
+            print(
+                f"REGRESSION {reg['case']} {reg['generator']} {reg['bars']} {reg['metric']}: "
+                f"{reg['baseline']:.4f} -> {reg['current']:.4f} ({reg['ratio']:.2f}x)"
+            )
+        if regressions:
+            return 1
+        print('No regressions')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Monte Carlo trade bootstrap for strategy robustness.
+
+`Stats.robustness_score` is a single point estimate from one ordering of trades. Here the per-trade
+log returns of a strategy are resampled with replacement into thousands of alternative trade
+sequences, giving confidence bands for the equity curve, drawdown, sharpe and grit.
+
+Paths are generated as a (paths x trades) matrix in chunks of `chunk` paths, so memory is bounded
+by the chunk rather than the path count. Equity and drawdown bands are kept at up to `steps` evenly
+spaced trade checkpoints. Chunks run across a process pool; each chunk draws from its own child of
+one SeedSequence, so results depend only on `seed` and `chunk`, not on the number of processes.
+
+Classes:
+- BootstrapResult: Per-path metrics and the confidence bands.
+
+Functions:
+- trade_returns(strategy): Log return of each trade of a strategy.
+- bootstrap(returns, n_paths, quantiles, chunk, steps, seed, processes, r_f): Runs the bootstrap.
+
+Usage:
+>>> strat = XOverStrat(slow=200, fast=50)
+>>> strat.update(price)
+>>> res = bootstrap(trade_returns(strat), n_paths=10000, seed=42)
+>>> res.metric_bands
+"""
+
+import multiprocessing
+import os
+import typing as t
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from .logic.stats import Stats
+
+METRICS = ['total_return', 'max_drawdown', 'sharpe', 'grit']
+
+
+@dataclass
+class BootstrapResult:
+    """
+    Attributes:
+    - paths (pd.DataFrame): One row per path with its total_return, max_drawdown, sharpe and grit.
+    - metric_bands (pd.DataFrame): Quantiles (columns) of each path metric (rows).
+    - equity_bands (pd.DataFrame): Quantiles (columns) of cumulative return after each checkpoint trade (rows).
+    - drawdown_bands (pd.DataFrame): Quantiles (columns) of drawdown after each checkpoint trade (rows).
+    """
+    paths: pd.DataFrame
+    metric_bands: pd.DataFrame
+    equity_bands: pd.DataFrame
+    drawdown_bands: pd.DataFrame
+
+
+def trade_returns(strategy) -> pd.Series:
+    """
+    Log return of each trade, from the strategy's `regime_ranges` log and its `Stats.log_returns`.
+
+    Parameters:
+    - strategy (VectorStrategy): A strategy that has been updated with price data.
+
+    Returns:
+    - pd.Series: Summed log return of each trade, indexed by trade count.
+    """
+    stats = Stats(strategy)
+    in_trade = stats.trade_count.notna()
+    return stats.log_returns[in_trade].fillna(0).groupby(stats.trade_count[in_trade]).sum()
+
+
+def _run_chunk(task):
+    """metrics of `n` paths plus their equity and drawdown at the checkpoints"""
+    returns, n, seed, checkpoints, r_f = task
+    rng = np.random.default_rng(seed)
+    sample = returns[rng.integers(0, len(returns), size=(n, len(returns)))]
+
+    cumul = np.cumsum(sample, axis=1)
+    # peak includes the starting 0 so a losing first trade is already a drawdown
+    peak = np.maximum(np.maximum.accumulate(cumul, axis=1), 0)
+    drawdown = np.expm1(cumul - peak)
+
+    std = sample.std(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = (sample.mean(axis=1) - r_f) / std
+        ulcer = np.sqrt(((cumul - peak) ** 2).sum(axis=1))
+        grit = cumul[:, -1] / ulcer
+    metrics = np.column_stack([np.expm1(cumul[:, -1]), drawdown.min(axis=1), sharpe, grit])
+    return metrics, np.expm1(cumul[:, checkpoints]), drawdown[:, checkpoints]
+
+
+def bootstrap(returns, n_paths=10000, quantiles=(.05, .25, .5, .75, .95), chunk=1000, steps=100,
+              seed=None, processes=None, r_f=0.00001) -> BootstrapResult:
+    """
+    Resamples trade returns with replacement into `n_paths` trade sequences of the same length.
+
+    Parameters:
+    - returns (pd.Series | np.ndarray): Log return per trade, e.g. from `trade_returns`.
+    - n_paths (int, optional): Number of resampled paths. Defaults to 10000.
+    - quantiles (tuple, optional): Band quantiles. Defaults to 5/25/50/75/95%.
+    - chunk (int, optional): Paths generated per chunk. Defaults to 1000.
+    - steps (int, optional): Maximum number of trade checkpoints in the equity/drawdown bands. Defaults to 100.
+    - seed (int, optional): Seed for reproducible paths.
+    - processes (int, optional): Worker count; 1 runs in this process. Defaults to os.cpu_count().
+    - r_f (float, optional): Risk-free return per trade for sharpe. Defaults to 0.00001, as in `Stats.sharpe`.
+
+    Returns:
+    - BootstrapResult: Per-path metrics and confidence bands.
+    """
+    returns = np.asarray(returns, dtype=float)
+    returns = returns[~np.isnan(returns)]
+    if len(returns) == 0:
+        raise ValueError('bootstrap: no trade returns to resample')
+    checkpoints = np.unique(np.linspace(0, len(returns) - 1, min(steps, len(returns))).round().astype(int))
+
+    sizes = [min(chunk, n_paths - start) for start in range(0, n_paths, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(returns, size, child, checkpoints, r_f) for size, child in zip(sizes, seeds)]
+
+    processes = min(processes or os.cpu_count() or 1, len(tasks))
+    if processes > 1:
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.map(_run_chunk, tasks)
+    else:
+        results = [_run_chunk(task) for task in tasks]
+
+    metrics = np.concatenate([res[0] for res in results])
+    equity = np.concatenate([res[1] for res in results])
+    drawdown = np.concatenate([res[2] for res in results])
+
+    paths = pd.DataFrame(metrics, columns=METRICS)
+    quantiles = list(quantiles)
+    trade = pd.Index(checkpoints + 1, name='trade')
+    return BootstrapResult(
+        paths=paths,
+        metric_bands=paths.quantile(quantiles).T,
+        equity_bands=pd.DataFrame(np.nanquantile(equity, quantiles, axis=0).T, index=trade, columns=quantiles),
+        drawdown_bands=pd.DataFrame(np.nanquantile(drawdown, quantiles, axis=0).T, index=trade, columns=quantiles),
+    )
@@ -0,0 +1,158 @@
+"""
+Content-addressed cache for expensive indicator results.
+
+Results are keyed by a hash of the input arrays plus the parameters used to compute them,
+so identical price frames are only processed once no matter which page, session or rerun asks.
+
+Two tiers:
+- memory: a process-wide LRU of pickled results, shared by every Streamlit session in the server.
+- disk: one pickle file per key under `path`, evicting the least recently used files once the
+  directory grows past `max_disk_bytes`; survives restarts.
+
+Values are stored pickled and unpickled on every hit, so callers always get their own copy and
+cannot mutate a cached result by reference.
+
+Classes:
+- ResultCache: The two-tier cache.
+
+Global Variables:
+- result_cache: The shared instance used by the indicators.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import typing as t
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+
+class ResultCache:
+    """
+    Two-tier (memory LRU + size-bounded disk) cache keyed by price content and parameters.
+
+    Attributes:
+    - path (Path): Directory of the disk tier.
+    - max_memory_items (int): Number of results kept in memory.
+    - max_disk_bytes (int): Size the disk tier is trimmed back to.
+
+    Methods:
+    - key(name, arrays, params): Builds the content key for a computation.
+    - get(key): Returns the cached result or None.
+    - set(key, value): Stores a result in both tiers.
+    - get_or_compute(name, arrays, params, compute): Returns the cached result, computing and storing it on a miss.
+    """
+    def __init__(self, path='.cache/strategy', max_memory_items=64, max_disk_bytes=512 * 2 ** 20):
+        self.path = Path(path)
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(name: str, arrays: t.Iterable, params: t.Dict[str, t.Any]) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(name.encode())
+        digest.update(repr(sorted(params.items())).encode())
+        for array in arrays:
+            array = np.ascontiguousarray(array)
+            if array.dtype.hasobject:
+                # object arrays hold pointers; hash their text instead
+                array = pd.util.hash_array(array.astype(str))
+            digest.update(f'{array.dtype.str}{array.shape}'.encode())
+            digest.update(array.data)
+        return digest.hexdigest()
+
+    def _file(self, key):
+        return self.path / f'{key}.pkl'
+
+    def get(self, key):
+        with self._lock:
+            blob = self._memory.get(key)
+            if blob is not None:
+                self._memory.move_to_end(key)
+        if blob is None:
+            blob = self._read_disk(key)
+            if blob is not None:
+                self._remember(key, blob)
+        with self._lock:
+            if blob is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return None if blob is None else pickle.loads(blob)
+
+    def set(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, blob)
+        self._write_disk(key, blob)
+
+    def get_or_compute(self, name: str, arrays: t.Iterable, params: t.Dict[str, t.Any], compute: t.Callable):
+        key = self.key(name, arrays, params)
+        res = self.get(key)
+        if res is None:
+            res = compute()
+            self.set(key, res)
+        return res
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        for file in self.path.glob('*.pkl'):
+            file.unlink(missing_ok=True)
+
+    def _remember(self, key, blob):
+        with self._lock:
+            self._memory[key] = blob
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    def _read_disk(self, key):
+        file = self._file(key)
+        try:
+            blob = file.read_bytes()
+            # touch so eviction sees this entry as recently used
+            os.utime(file)
+        except OSError:
+            return None
+        return blob
+
+    def _write_disk(self, key, blob):
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            # write to a temp file and rename so concurrent readers never see a partial pickle
+            fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp, self._file(key))
+            self._evict()
+        except OSError as e:
+            print(f'ResultCache: could not write {key}: {e}')
+
+    def _evict(self):
+        files = []
+        for file in self.path.glob('*.pkl'):
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, file))
+        total = sum(size for _, size, _ in files)
+        for _, size, file in sorted(files, key=lambda f: f[0]):
+            if total <= self.max_disk_bytes:
+                break
+            file.unlink(missing_ok=True)
+            total -= size
+
+
+result_cache = ResultCache()
+"""
+Shared cache instance used by the indicators.
+"""
@@ -0,0 +1,104 @@
+"""
+Opt-in compact numeric mode for price and indicator frames.
+
+When enabled, float64 price and indicator columns are stored as float32, signal columns as int8
+and symbol columns as categoricals, roughly halving the memory of long histories and wide scans.
+A column is only downcast if the round trip stays within `tolerance` (relative error), so values
+float32 cannot represent (overflow, extreme magnitudes) stay float64, and signals holding NaN or
+non-integer values keep their float type.
+
+Enable with the STRATEGY_COMPACT=1 environment variable, or set `compact_settings.enabled`.
+
+Classes:
+- CompactSettings: Whether compact mode is on and its tolerance.
+
+Functions:
+- compact(df, tolerance): Returns a downcast copy of a frame.
+- maybe_compact(df): Applies `compact` only when compact mode is enabled.
+
+Global Variables:
+- compact_settings: The process-wide settings.
+"""
+
+import os
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+SIGNAL_COLUMNS = ['tr_signal', 'breakout_signal', 'rg', 'signal']
+CATEGORY_COLUMNS = ['symbol']
+
+
+@dataclass
+class CompactSettings:
+    """
+    Attributes:
+    - enabled (bool): Whether frames are compacted along the fetch -> indicator -> display pipeline.
+    - tolerance (float): Maximum relative error accepted when downcasting a float column.
+    """
+    enabled: bool = False
+    tolerance: float = 1e-6
+
+
+compact_settings = CompactSettings(
+    enabled=os.getenv('STRATEGY_COMPACT', '0') == '1',
+    tolerance=float(os.getenv('STRATEGY_COMPACT_TOLERANCE', 1e-6)),
+)
+
+
+def _fits_float32(values: np.ndarray, tolerance: float) -> bool:
+    with np.errstate(invalid='ignore', over='ignore'):
+        restored = values.astype(np.float32).astype(np.float64)
+        same_nan = np.array_equal(np.isnan(values), np.isnan(restored))
+        finite = np.isfinite(values)
+        if not same_nan or not np.array_equal(finite, np.isfinite(restored)):
+            return False
+        scale = np.maximum(np.abs(values[finite]), np.finfo(np.float64).tiny)
+        return bool(np.all(np.abs(restored[finite] - values[finite]) <= tolerance * scale))
+
+
+def _is_int8(values: np.ndarray) -> bool:
+    return bool(
+        np.all(np.isfinite(values))
+        and np.all(values == np.round(values))
+        and (len(values) == 0 or (values.min() >= -128 and values.max() <= 127))
+    )
+
+
+def compact(df: pd.DataFrame, tolerance=None) -> pd.DataFrame:
+    """
+    Returns a copy of `df` with float64 columns as float32, signal columns as int8 and symbol columns
+    as categoricals, skipping any column that would not round-trip within `tolerance`.
+
+    Parameters:
+    - df (pd.DataFrame): The frame to compact.
+    - tolerance (float, optional): Maximum relative error. Defaults to `compact_settings.tolerance`.
+
+    Returns:
+    - pd.DataFrame: The compacted frame.
+    """
+    if tolerance is None:
+        tolerance = compact_settings.tolerance
+    dtypes = {}
+    for col in df.columns:
+        series = df[col]
+        if col in CATEGORY_COLUMNS and (series.dtype == object or pd.api.types.is_string_dtype(series.dtype)):
+            dtypes[col] = 'category'
+        elif col in SIGNAL_COLUMNS and pd.api.types.is_numeric_dtype(series.dtype) and series.dtype != np.int8:
+            if _is_int8(series.to_numpy(dtype=np.float64)):
+                dtypes[col] = np.int8
+            elif series.dtype == np.float64 and _fits_float32(series.to_numpy(), tolerance):
+                dtypes[col] = np.float32
+        elif series.dtype == np.float64:
+            if _fits_float32(series.to_numpy(), tolerance):
+                dtypes[col] = np.float32
+    return df.astype(dtypes) if dtypes else df.copy()
+
+
+def maybe_compact(df):
+    """
+    Compacts a DataFrame when compact mode is enabled; anything else is returned unchanged.
+    """
+    if compact_settings.enabled and isinstance(df, pd.DataFrame):
+        return compact(df)
+    return df
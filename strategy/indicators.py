@@ -1,10 +1,14 @@
 from typing import Literal
 from .logic.indicator import Indicator
+from .cache import result_cache
+from .compact import compact_settings, maybe_compact
 import src.floor_ceiling_regime as fcr
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 import numpy as np
+import dataclasses
+from copy import copy
 
 
 def addBand(price, window):
@@ -100,6 +104,143 @@ def addBandAggregatePeakConcat(price, peak_window, peaks, fast_band=False):
     return price, band_window
 
 
+def first_cross(close, start, threshold, direction=1):
+    """
+    Finds, for many thresholds at once, the first bar at or after `start` where price crosses the threshold.
+
+    A sparse table of block maxima is built once, then every search is resolved together
+    by binary lifting: O((n + s) log n) instead of one O(n) scan per threshold.
+
+    Parameters:
+    - close (np.ndarray): The price series.
+    - start (np.ndarray): The first bar to search from, one per threshold.
+    - threshold (np.ndarray): The price to cross, one per start.
+    - direction (int, optional): 1 finds close > threshold, -1 finds close < threshold. Defaults to 1.
+
+    Returns:
+    - np.ndarray: The index of the first cross for each threshold, or len(close) when price never crosses.
+    """
+    values = np.asarray(close, dtype=float) * direction
+    threshold = np.asarray(threshold, dtype=float) * direction
+    pos = np.asarray(start, dtype=np.int64).copy()
+    n = len(values)
+    if n == 0 or len(pos) == 0:
+        return np.full(len(pos), n, dtype=np.int64)
+
+    # levels[k][i] holds max(values[i:i + 2**k]), NaN-ignoring like pandas
+    levels = [values]
+    while 2 ** len(levels) <= n:
+        prev = levels[-1]
+        half = 2 ** (len(levels) - 1)
+        levels.append(np.fmax(prev[:-half], prev[half:]))
+
+    for k in range(len(levels) - 1, -1, -1):
+        block = levels[k]
+        can_jump = pos + 2 ** k <= n
+        block_max = block[np.where(can_jump, pos, 0)]
+        # jump over the block only if nothing inside it crosses
+        pos = np.where(can_jump & ~(block_max > threshold), pos + 2 ** k, pos)
+    return pos
+
+
+def range_extreme(close, start, stop, direction=1):
+    """
+    Computes the max (direction=1) or min (direction=-1) of close[start:stop] for many ranges in a single reduceat pass.
+
+    Parameters:
+    - close (np.ndarray): The price series.
+    - start (np.ndarray): Inclusive start of each range.
+    - stop (np.ndarray): Exclusive end of each range, must be greater than start.
+    - direction (int, optional): 1 for the max, -1 for the min. Defaults to 1.
+
+    Returns:
+    - np.ndarray: The extreme value of each range.
+    """
+    ufunc = np.fmax if direction == 1 else np.fmin
+    # pad so a range ending at the last bar still has a valid stop index
+    padded = np.append(np.asarray(close, dtype=float), np.nan)
+    bounds = np.column_stack([start, stop]).ravel()
+    return ufunc.reduceat(padded, bounds)[::2]
+
+
+def rolling_mean(values, window):
+    """
+    Rolling mean along the last axis, matching pandas `rolling(window).mean()`:
+    NaN until `window` bars are available and for any window containing a NaN.
+    Works on a single series or a (symbols x bars) panel.
+
+    Parameters:
+    - values (np.ndarray): The input series or panel.
+    - window (int): The rolling window size.
+
+    Returns:
+    - np.ndarray: The rolling mean, same shape as `values`.
+    """
+    values = np.asarray(values, dtype=float)
+    res = np.full(values.shape, np.nan)
+    if window > values.shape[-1]:
+        return res
+    valid = ~np.isnan(values)
+    pad = [(0, 0)] * (values.ndim - 1) + [(1, 0)]
+    csum = np.pad(np.cumsum(np.where(valid, values, 0.0), axis=-1), pad)
+    ccount = np.pad(np.cumsum(valid, axis=-1), pad)
+    window_sum = csum[..., window:] - csum[..., :-window]
+    full = (ccount[..., window:] - ccount[..., :-window]) == window
+    res[..., window - 1:] = np.where(full, window_sum / window, np.nan)
+    return res
+
+
+def true_range(high, low, close):
+    """
+    True range: the largest of high - low, |high - prev close| and |low - prev close|.
+    The first bar has no previous close and falls back to high - low.
+    Works on a single series or a (symbols x bars) panel.
+
+    Parameters:
+    - high (np.ndarray): High prices.
+    - low (np.ndarray): Low prices.
+    - close (np.ndarray): Close prices.
+
+    Returns:
+    - np.ndarray: The true range per bar.
+    """
+    prev_close = np.empty_like(close)
+    prev_close[..., :1] = np.nan
+    prev_close[..., 1:] = close[..., :-1]
+    return np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+
+
+def atr_volume_breakout(high, low, close, volume, atr_short_period=14, atr_period=50, vol_period=50, atr_threshold=1.0, vol_threshold=1.0):
+    """
+    Computes ATR, ATR mean, volume mean and the breakout signal directly on arrays,
+    without building intermediate frames. Works on a single series or a (symbols x bars) panel.
+
+    Parameters:
+    - high, low, close, volume (np.ndarray): Price and volume series.
+    - atr_short_period (int): Rolling window for ATR.
+    - atr_period (int): Rolling window for the ATR mean.
+    - vol_period (int): Rolling window for the volume mean.
+    - atr_threshold (float): Multiplier for ATR above its mean to trigger a signal.
+    - vol_threshold (float): Multiplier for volume above its mean to trigger a signal.
+
+    Returns:
+    - dict: 'atr', 'atr_mean', 'vol_mean' and 'breakout_signal' arrays.
+    """
+    atr = rolling_mean(true_range(high, low, close), atr_short_period)
+    atr_mean = rolling_mean(atr, atr_period)
+    vol_mean = rolling_mean(volume, vol_period)
+    spike = (atr > atr_mean * atr_threshold) & (volume > vol_mean * vol_threshold)
+    direction = np.zeros(close.shape)
+    direction[..., 1:] = np.sign(close[..., 1:] - close[..., :-1])
+    breakout_signal = np.where(spike, np.nan_to_num(direction), 0).astype(int)
+    return {
+        'atr': atr,
+        'atr_mean': atr_mean,
+        'vol_mean': vol_mean,
+        'breakout_signal': breakout_signal,
+    }
+
+
 class MoveAvg(Indicator):
     _window: int
 
@@ -160,7 +301,7 @@ class BollingerBand(Indicator):
         self._middle = self._indicators.add(MoveAvg(window))
 
     def _update(self, value):
-        std = value.rolling(self._window).std() * self._std
+        std = value.close.rolling(self._window).std() * self._std
         self._value = pd.DataFrame({
             'upper': self._middle.value + std, 
             'lower': self._middle.value - std
@@ -210,7 +351,8 @@ class TradingRange(Indicator):
             'min': rolling_min,
             'max': rolling_max
         })
-        return value
+        self._value = maybe_compact(value)
+        return self._value
     
     @property
     def upper(self):
@@ -243,14 +385,29 @@ class TradingRange(Indicator):
 
 import src.regime.utils as sru
 
+
+def price_arrays(value: pd.DataFrame):
+    """
+    Arrays identifying a price frame for result caching: a hash of every row (index included) and the
+    column names and dtypes. The cached tables carry the whole frame (timestamps, open, volume), so
+    frames that only share close/high/low must not share a key.
+    """
+    columns = np.asarray([f'{col}:{dtype}' for col, dtype in value.dtypes.items()], dtype=object)
+    return [pd.util.hash_pandas_object(value, index=True).to_numpy(), columns]
+
+
 class Peak(Indicator):
-    def __init__(self):
+    def __init__(self, distance_pct=0.05, retrace_pct=0.05, swing_window=63, sw_lvl=3):
         super().__init__()
         self._value = None
         self._px_with_swing = None
+        self._params = dict(distance_pct=distance_pct, retrace_pct=retrace_pct, swing_window=swing_window, sw_lvl=sw_lvl)
 
     def _update(self, value):
-        table, px_with_swing = fcr.init_peak_table(value, distance_pct=0.05, retrace_pct=0.05, swing_window=63, sw_lvl=3)
+        table, px_with_swing = result_cache.get_or_compute(
+            'init_peak_table', price_arrays(value), self._params,
+            lambda: fcr.init_peak_table(value, **self._params)
+        )
         self._value = table
         self._px_with_swing = px_with_swing
         return self._value
@@ -262,7 +419,10 @@ class Regime(Indicator):
 
     def _update(self, value) -> fcr.FcStrategyTables:
         value = value.reset_index(drop=True).reset_index().rename(columns={'index': 'bar_number'})
-        self._value = fcr.fc_scale_strategy_live(value, find_retest_swing=False)
+        self._value = result_cache.get_or_compute(
+            'fc_scale_strategy_live', price_arrays(value), {'find_retest_swing': False, 'compact': compact_settings.enabled},
+            lambda: compact_tables(fcr.fc_scale_strategy_live(value, find_retest_swing=False))
+        )
         print(self._value.peak_table.columns)
         return self._value
     
@@ -306,57 +466,41 @@ class Regime(Indicator):
          - record the percent change between entry and max price (if processing swing low), or min price if swing high
         """
         peaks = self._value.peak_table.loc[self._value.peak_table.lvl == 2].copy()
-        price_data = self._value.enhanced_price_data
-        
+        close = self._value.enhanced_price_data['close'].to_numpy(dtype=float)
+        n = len(close)
+
         results = []
         for sw_type in [1, -1]:
             swings = peaks.loc[(peaks.type == sw_type)]
-            
-            for _, swing in swings.iterrows():
-                swing_end = int(swing['end'])
-                swing_price = swing['en_px']
-                
-                # Get price data after swing end
-                future_prices = price_data.iloc[swing_end + 1:]
-                
-                if len(future_prices) == 0:
-                    continue
-                
-                # Find first cross based on swing type
-                if sw_type == 1:  # Swing low - look for price crossing above
-                    cross_idx = future_prices[future_prices['close'] > swing_price].index
-                    if len(cross_idx) > 0:
-                        bars_to_cross = cross_idx[0] - swing_end
-                        max_price = future_prices.loc[:cross_idx[0], 'close'].max()
-                        pct_change = ((max_price - swing_price) / swing_price) * 100
-                        active = False
-                    else:
-                        bars_to_cross = len(future_prices)
-                        max_price = future_prices['close'].max()
-                        pct_change = ((max_price - swing_price) / swing_price) * 100
-                        active = True
-                else:  # Swing high - look for price crossing below
-                    cross_idx = future_prices[future_prices['close'] < swing_price].index
-                    if len(cross_idx) > 0:
-                        bars_to_cross = cross_idx[0] - swing_end
-                        min_price = future_prices.loc[:cross_idx[0], 'close'].min()
-                        pct_change = ((swing_price - min_price) / swing_price) * 100
-                        active = False
-                    else:
-                        bars_to_cross = len(future_prices)
-                        min_price = future_prices['close'].min()
-                        pct_change = ((swing_price - min_price) / swing_price) * 100
-                        active = True
-                
-                results.append({
-                    'swing_type': sw_type,
-                    'swing_end': swing_end,
-                    'swing_price': swing_price,
-                    'bars_to_cross': bars_to_cross,
-                    'pct_change': pct_change,
-                    'active': active
-                })
-        return pd.DataFrame(results)
+            swing_end = swings['end'].to_numpy().astype(np.int64)
+            swing_price = swings['en_px'].to_numpy(dtype=float)
+
+            # skip swings with no price data after swing end
+            has_future = swing_end + 1 < n
+            swing_end = swing_end[has_future]
+            swing_price = swing_price[has_future]
+            if len(swing_end) == 0:
+                continue
+
+            # swing low (1) looks for price crossing above, swing high (-1) for crossing below
+            cross = first_cross(close, swing_end + 1, swing_price, direction=sw_type)
+            active = cross >= n
+            bars_to_cross = np.where(active, n - 1 - swing_end, cross - swing_end)
+            # extreme price between swing end and cross, inclusive of the crossing bar
+            extreme = range_extreme(close, swing_end + 1, np.minimum(cross + 1, n), direction=sw_type)
+            pct_change = ((extreme - swing_price) / swing_price) * 100 * sw_type
+
+            results.append(pd.DataFrame({
+                'swing_type': sw_type,
+                'swing_end': swing_end,
+                'swing_price': swing_price,
+                'bars_to_cross': bars_to_cross,
+                'pct_change': pct_change,
+                'active': active
+            }))
+        if not results:
+            return pd.DataFrame()
+        return pd.concat(results, ignore_index=True)
     
     def plot_peak_best_case(self, peaks_df=None, top_n=None, target_fig: go.Figure = None):
         """
@@ -456,6 +600,143 @@ class Regime(Indicator):
             
     
 
+def _replace_tables(tables, **fields):
+    """Returns a copy of a strategy tables object with the given fields replaced."""
+    if dataclasses.is_dataclass(tables):
+        return dataclasses.replace(tables, **fields)
+    if hasattr(tables, '_replace'):
+        return tables._replace(**fields)
+    tables = copy(tables)
+    for name, field in fields.items():
+        setattr(tables, name, field)
+    return tables
+
+
+def compact_tables(tables):
+    """Compacts every DataFrame of a strategy tables object when compact mode is enabled."""
+    if not compact_settings.enabled:
+        return tables
+    return _replace_tables(tables, **{name: maybe_compact(getattr(tables, name)) for name in _table_fields(tables)})
+
+
+def _table_fields(tables):
+    """Names of the DataFrame fields held by a strategy tables object."""
+    if dataclasses.is_dataclass(tables):
+        names = [f.name for f in dataclasses.fields(tables)]
+    elif hasattr(tables, '_fields'):
+        names = list(tables._fields)
+    else:
+        names = list(vars(tables))
+    return [name for name in names if isinstance(getattr(tables, name), pd.DataFrame)]
+
+
+class LiveRegime(Regime):
+    """
+    Floor/ceiling regime that resumes from a checkpoint when bars are appended.
+
+    After each run the engine snapshots a checkpoint bar: the earlier of the start of the last
+    confirmed level-3 swing and the start of the current regime. Rows that begin before the
+    checkpoint cannot be changed by new bars, so when the next price frame only appends bars
+    (or revises the last, still-forming one) the engine recomputes the tail from
+    `checkpoint - warmup` and splices its rows from the checkpoint onwards into the
+    retained peak, regime and price tables. Anything else falls back to a full recompute.
+
+    Attributes:
+    - warmup (int): Bars before the checkpoint fed to the tail recompute so swing detection has its lookback.
+    - validate (bool): Also run a full recompute and raise ValueError if the spliced tables differ from it.
+    """
+    _bar_cols = ['start', 'end', 'fc_date', 'rg_ch_date', 'bar_number']
+    _key_cols = ['start', 'fc_date', 'bar_number']
+
+    def __init__(self, warmup=126, validate=False):
+        super().__init__()
+        self.warmup = warmup
+        self.validate = validate
+        self._checkpoint = None
+        self._history = None
+
+    def _compute(self, value, offset=0):
+        value = value.reset_index(drop=True).reset_index().rename(columns={'index': 'bar_number'})
+        tables = compact_tables(fcr.fc_scale_strategy_live(value, find_retest_swing=False))
+        if offset:
+            tables = _replace_tables(tables, **{
+                name: self._shift(getattr(tables, name), offset) for name in _table_fields(tables)
+            })
+        return tables
+
+    def _shift(self, table, offset):
+        table = table.copy()
+        for col in self._bar_cols:
+            if col in table.columns:
+                table[col] = table[col] + offset
+        if 'bar_number' in table.columns:
+            table.index = table.index + offset
+        return table
+
+    def _splice(self, head, tail, checkpoint):
+        """head rows that begin before the checkpoint, then tail rows from it"""
+        key = next((col for col in self._key_cols if col in tail.columns), None)
+        if key is None or key not in head.columns:
+            return tail
+        return pd.concat([
+            head.loc[head[key] < checkpoint],
+            tail.loc[tail[key] >= checkpoint]
+        ])
+
+    def _resume_bar(self, value):
+        """bar to resume from, or None when the new frame does not extend the retained history"""
+        if self._checkpoint is None or self._history is None:
+            return None
+        # the last retained bar may still have been forming, everything before it must be unchanged
+        settled = len(self._history) - 1
+        if len(value) < len(self._history) or self._checkpoint > settled:
+            return None
+        cols = ['close', 'high', 'low']
+        if not np.array_equal(value[cols].to_numpy()[:settled], self._history[:settled], equal_nan=True):
+            return None
+        return self._checkpoint
+
+    def _find_checkpoint(self, tables):
+        peaks = tables.peak_table
+        regimes = tables.regime_table
+        major = peaks.loc[peaks.lvl == 3]
+        if major.empty or regimes.empty:
+            return None
+        candidates = [major.sort_values('end')['start'].iloc[-1], regimes['start'].iloc[-1]]
+        # rows ending on the last, still-forming bar (or closed by it) are provisional too
+        last_bar = len(tables.enhanced_price_data) - 1
+        for table in (peaks, regimes):
+            candidates.extend(table.loc[table['end'] >= last_bar - 1, 'start'])
+        return int(min(candidates))
+
+    def _update(self, value) -> fcr.FcStrategyTables:
+        value = value.reset_index(drop=True)
+        checkpoint = self._resume_bar(value)
+        if checkpoint is None:
+            tables = self._compute(value)
+        else:
+            offset = max(checkpoint - self.warmup, 0)
+            tail = self._compute(value.iloc[offset:], offset=offset)
+            head = self._raw_value
+            tables = _replace_tables(tail, **{
+                name: self._splice(getattr(head, name), getattr(tail, name), checkpoint)
+                for name in _table_fields(tail)
+            })
+            if self.validate:
+                full = self._compute(value)
+                diverged = [
+                    name for name in _table_fields(full)
+                    if not getattr(full, name).reset_index(drop=True).equals(getattr(tables, name).reset_index(drop=True))
+                ]
+                if diverged:
+                    raise ValueError(f'LiveRegime: tail recompute from bar {checkpoint} differs from a full recompute in {diverged}')
+
+        self._history = value[['close', 'high', 'low']].to_numpy()
+        self._checkpoint = self._find_checkpoint(tables)
+        self._value = tables
+        return self._value
+
+
 class TradingRangePeak(Indicator):
     """
     Extends TradingRange with peak-based calculations.
@@ -481,7 +762,7 @@ class TradingRangePeak(Indicator):
         tr.loc[(tr['close'] > tr['trading_range_hi_band']) & (tr['close'] <= tr['trading_range_lo_band']), 'tr_signal'] = 2
         tr.loc[(tr['close'] > tr['trading_range_lo_band']) & (tr['close'] <= tr['band_76']), 'tr_signal'] = 3
         tr.loc[(tr['close'] > tr['band_76']) & (tr['close'] <= tr['rolling_max']), 'tr_signal'] = 4
-        return tr
+        return maybe_compact(tr)
     
     def plot(self, data, fig, x = None, ):
         if x is None:
@@ -515,7 +796,7 @@ class ATRVolumeBreakout(Indicator):
 
     Output
     ------
-    DataFrame with added columns:
+    DataFrame indexed like the input with only the indicator columns:
     - 'atr': raw ATR values
     - 'atr_mean': mean ATR over `atr_period`
     - 'vol_mean': mean volume over `vol_period`
@@ -535,29 +816,25 @@ class ATRVolumeBreakout(Indicator):
         self.vol_short_period = vol_short_period
     
     def _compute_atr(self, df):
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift(1))
-        low_close = np.abs(df['low'] - df['close'].shift(1))
-        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr = tr.rolling(window=self.atr_short_period).mean()
-        return atr
+        tr = true_range(df['high'].to_numpy(dtype=float), df['low'].to_numpy(dtype=float), df['close'].to_numpy(dtype=float))
+        return pd.Series(rolling_mean(tr, self.atr_short_period), index=df.index)
 
     def _update(self, df: pd.DataFrame) -> pd.DataFrame:
         assert 'volume' in df.columns, "Input DataFrame must contain a 'volume' column"
-        df = df.copy()
-        df['atr'] = self._compute_atr(df)
-        df['atr_mean'] = df['atr'].rolling(self.atr_period).mean()
-        df['vol_mean'] = df['volume'].rolling(self.vol_period).mean()
-
-        atr_spike = df['atr'] > (df['atr_mean'] * self.atr_threshold)
-        vol_spike = df['volume'] > (df['vol_mean'] * self.vol_threshold)
-        direction = np.sign(df['close'].diff())
-        df['breakout_signal'] = np.where(
-            atr_spike & vol_spike, direction, 0
-        ).astype(int)
-
-        self._value = df
-        return df
+        res = atr_volume_breakout(
+            df['high'].to_numpy(dtype=float),
+            df['low'].to_numpy(dtype=float),
+            df['close'].to_numpy(dtype=float),
+            df['volume'].to_numpy(dtype=float),
+            atr_short_period=self.atr_short_period,
+            atr_period=self.atr_period,
+            vol_period=self.vol_period,
+            atr_threshold=self.atr_threshold,
+            vol_threshold=self.vol_threshold,
+        )
+        res = maybe_compact(pd.DataFrame(res, index=df.index))
+        self._value = res
+        return res
 
     def plot(self, fig, x, data):
 
@@ -567,12 +844,10 @@ class ATRVolumeBreakout(Indicator):
         # fig.add_trace(go.Scatter(x=x, y=data['vol_mean'], name='Volume Mean', yaxis='y2'))
 
 
-        sig_up = data.copy()
-        sig_up.loc[(sig_up.breakout_signal == -1) | (sig_up.breakout_signal == 0), 'breakout_signal'] = np.nan
-        sig_up['breakout_signal'] = sig_up.loc[sig_up.breakout_signal == 1, 'close']
-        sig_dn = data.copy()
-        sig_dn.loc[(sig_dn.breakout_signal == 1) | (sig_dn.breakout_signal == 0), 'breakout_signal'] = np.nan
-        sig_dn['breakout_signal'] = sig_dn.loc[sig_dn.breakout_signal == -1, 'close']
+        close = self._price['close'].to_numpy(dtype=float)
+        signal = data['breakout_signal'].to_numpy()
+        sig_up = pd.DataFrame({'breakout_signal': np.where(signal == 1, close, np.nan)}, index=data.index)
+        sig_dn = pd.DataFrame({'breakout_signal': np.where(signal == -1, close, np.nan)}, index=data.index)
 
 
         fig.add_trace(go.Scatter(
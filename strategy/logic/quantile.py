@@ -0,0 +1,183 @@
+"""
+Approximate expanding and rolling quantiles with bounded error, without a per-bar sort.
+
+Values are bucketed into a log-spaced sketch (as in DDSketch): every bucket's representative is
+within `rel_err` (relative) of every value in it, with separate buckets for negative values and an
+exact bucket for zero. Quantiles are then read from cumulative bucket counts at checkpoints spaced so
+that no bar is further than `rank_err` (as a fraction of the sample size) from its checkpoint.
+
+Guarantee: like pandas, a quantile interpolates linearly between the values at the two ranks around
+q * (n - 1). For every bar, each of those two values is within `rel_err` of some value whose rank in
+the expanding (or rolling) sample is within `rank_err * n` of the rank it stands for, where n is the
+sample size at that bar. Checkpoints are exact up to 1/rank_err values, so small samples interpolate
+between the right neighbours.
+
+All work is histogram counting and cumulative sums, O(bars + checkpoints x buckets). Expanding
+checkpoints grow geometrically, so an expanding quantile of a million bars takes ~0.15s instead of
+seconds; rolling checkpoints are `rank_err * window` bars apart, which pays off on long windows.
+
+Functions:
+- expanding_quantiles: Approximate `expanding().quantile(q)` for several q at once.
+- rolling_quantiles: Approximate `rolling(window).quantile(q)` for several q at once.
+"""
+
+import typing as t
+import numpy as np
+import pandas as pd
+
+MIN_VALUE = 1e-12
+"""Magnitudes below this go in the zero bucket."""
+
+_CHUNK_ROWS = 512
+_MIN_ROLLING_STEP = 32
+"""Below this many bars between rolling checkpoints, pandas' exact rolling quantile is faster."""
+
+
+def _bucket(values: np.ndarray, rel_err: float):
+    """ordered bucket of each value and the representative value of each bucket"""
+    gamma = (1 + rel_err) / (1 - rel_err)
+    magnitude = np.abs(values)
+    nonzero = magnitude > MIN_VALUE
+    index = np.zeros(len(values), dtype=np.int64)
+    index[nonzero] = np.ceil(np.log(magnitude[nonzero]) / np.log(gamma)).astype(np.int64)
+    offset = 1 - index[nonzero].min() if nonzero.any() else 0
+    # negatives sort before zero, larger magnitudes further from zero
+    key = np.where(nonzero, np.sign(values).astype(np.int64) * (index + offset), 0)
+    # keys span a small integer range, so number the occupied ones with a bincount instead of a sort
+    low = key.min()
+    occupied = np.bincount(key - low) > 0
+    keys = np.flatnonzero(occupied) + low
+    bucket = (np.cumsum(occupied) - 1)[key - low]
+    exponent = np.abs(keys) - offset
+    representative = np.where(keys == 0, 0.0, np.sign(keys) * 2 * gamma ** exponent.astype(float) / (gamma + 1))
+    return bucket, representative
+
+
+def _interpolated(counts, quantiles, representative):
+    """
+    each quantile of every row of per-bucket sample counts, interpolated linearly between the values
+    at the two neighbouring ranks like pandas
+    """
+    ranks = np.cumsum(counts, axis=1)
+    n = ranks[:, -1]
+    res = np.empty((len(quantiles), len(counts)))
+    for qi, q in enumerate(quantiles):
+        position = q * (n - 1)
+        lower = np.floor(position)
+        # 1-based ranks of the values just below and just above the 0-based position
+        below = representative[np.argmax(ranks >= (lower + 1)[:, None], axis=1)]
+        above = representative[np.argmax(ranks >= np.minimum(lower + 2, n)[:, None], axis=1)]
+        res[qi] = below + (position - lower) * (above - below)
+    return res
+
+
+def _histograms(bucket, n_buckets, edges):
+    """per-bucket counts of values between consecutive `edges`, one row per interval"""
+    segment = np.repeat(np.arange(len(edges) - 1), np.diff(edges))
+    values = bucket[edges[0]:edges[-1]]
+    return np.bincount(segment * n_buckets + values, minlength=(len(edges) - 1) * n_buckets).reshape(-1, n_buckets)
+
+
+def expanding_quantiles(values: pd.Series, quantiles: t.Sequence[float], rel_err=0.01, rank_err=0.01) -> pd.DataFrame:
+    """
+    Approximate `values.expanding().quantile(q)` for each q, skipping NaN like pandas.
+
+    Parameters:
+    - values (pd.Series): The series.
+    - quantiles (list[float]): Quantiles in [0, 1].
+    - rel_err (float, optional): Relative value error bound. Defaults to 0.01.
+    - rank_err (float, optional): Rank error bound, as a fraction of the sample size. Defaults to 0.01.
+
+    Returns:
+    - pd.DataFrame: One column per quantile, indexed like `values`.
+    """
+    x = values.to_numpy(dtype=float)
+    valid = ~np.isnan(x)
+    y = x[valid]
+    res = pd.DataFrame(np.nan, index=values.index, columns=list(quantiles))
+    if len(y) == 0:
+        return res
+    bucket, representative = _bucket(y, rel_err)
+
+    # checkpoint sample sizes: every size up to 1/rank_err, then growing by rank_err each time
+    sizes = [1]
+    while sizes[-1] < len(y):
+        sizes.append(min(len(y), sizes[-1] + max(1, int(rank_err * sizes[-1]))))
+    sizes = np.array(sizes)
+    found = np.empty((len(quantiles), len(sizes)))
+    carry = np.zeros(len(representative), dtype=np.int64)
+    for first in range(0, len(sizes), _CHUNK_ROWS):
+        edges = np.concatenate(([0 if first == 0 else sizes[first - 1]], sizes[first:first + _CHUNK_ROWS]))
+        cumulative = np.cumsum(_histograms(bucket, len(representative), edges), axis=0) + carry
+        carry = cumulative[-1]
+        found[:, first:first + _CHUNK_ROWS] = _interpolated(cumulative, quantiles, representative)
+
+    count = np.cumsum(valid)
+    checkpoint = np.searchsorted(sizes, count, side='right') - 1
+    has_value = count > 0
+    for qi, q in enumerate(quantiles):
+        column = np.full(len(x), np.nan)
+        column[has_value] = found[qi, checkpoint[has_value]]
+        res[q] = column
+    return res
+
+
+def rolling_quantiles(values: pd.Series, window: int, quantiles: t.Sequence[float], rel_err=0.01, rank_err=0.01) -> pd.DataFrame:
+    """
+    Approximate `values.rolling(window).quantile(q)` for each q; like pandas, a window holding NaN is NaN.
+    Windows too short for checkpoints to save work (`rank_err * window` under 32 bars) use pandas'
+    exact rolling quantile, which is within any error bound.
+
+    Parameters:
+    - values (pd.Series): The series.
+    - window (int): The rolling window size.
+    - quantiles (list[float]): Quantiles in [0, 1].
+    - rel_err (float, optional): Relative value error bound. Defaults to 0.01.
+    - rank_err (float, optional): Rank error bound, as a fraction of `window`. Defaults to 0.01.
+
+    Returns:
+    - pd.DataFrame: One column per quantile, indexed like `values`.
+    """
+    step = int(rank_err * window)
+    if step < _MIN_ROLLING_STEP:
+        return pd.DataFrame({q: values.rolling(window).quantile(q) for q in quantiles}, index=values.index)
+    x = values.to_numpy(dtype=float)
+    res = pd.DataFrame(np.nan, index=values.index, columns=list(quantiles))
+    if len(x) < window:
+        return res
+    valid = ~np.isnan(x)
+    bucket, representative = _bucket(np.where(valid, x, 0.0), rel_err)
+
+    # windows ending on every `step`-th bar; a bar reads the last checkpoint window at or before it.
+    # checkpoint window j covers [j * step, window + j * step): it is the first window plus the values
+    # entering since (blocks after `window`) minus the values leaving (blocks after 0)
+    n_checkpoints = (len(x) - window) // step + 1
+    n_buckets = len(representative)
+    found = np.empty((len(quantiles), n_checkpoints))
+    current = np.bincount(bucket[:window], minlength=n_buckets)
+    for first in range(0, n_checkpoints, _CHUNK_ROWS):
+        last = min(first + _CHUNK_ROWS, n_checkpoints)
+        # `current` is checkpoint `first`; each following row adds one entering block and drops one leaving block
+        edges_out = np.arange(first, last) * step
+        delta = np.zeros((last - first, n_buckets), dtype=np.int64)
+        if last - first > 1:
+            moved = _histograms(bucket, n_buckets, edges_out + window) - _histograms(bucket, n_buckets, edges_out)
+            delta[1:] = np.cumsum(moved, axis=0)
+        windows = current + delta
+        found[:, first:last] = _interpolated(windows, quantiles, representative)
+        current = windows[-1]
+        if last < n_checkpoints:
+            # move from checkpoint last - 1 to checkpoint last
+            out_lo, in_lo = (last - 1) * step, (last - 1) * step + window
+            current = current - np.bincount(bucket[out_lo:out_lo + step], minlength=n_buckets) \
+                + np.bincount(bucket[in_lo:in_lo + step], minlength=n_buckets)
+
+    bars = np.arange(window - 1, len(x))
+    checkpoint = (bars - (window - 1)) // step
+    n_valid = np.concatenate(([0], np.cumsum(valid)))
+    full = (n_valid[bars + 1] - n_valid[bars + 1 - window]) == window
+    for qi, q in enumerate(quantiles):
+        column = np.full(len(x), np.nan)
+        column[bars] = np.where(full, found[qi, checkpoint], np.nan)
+        res[q] = column
+    return res
@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from .quantile import expanding_quantiles, rolling_quantiles
 
 def rolling_sharpe(returns, r_f, window):
     avg_returns = returns.rolling(window).mean()
@@ -59,17 +60,25 @@ def profit_ratio(profits, losses):
     return pr
 
 
-def rolling_tail_ratio(cumul_returns, window, percentile=0.05,limit=5):
-    left_tail = np.abs(cumul_returns.rolling(window).quantile(percentile))
-    right_tail = cumul_returns.rolling(window).quantile(1-percentile)
+def rolling_tail_ratio(cumul_returns, window, percentile=0.05,limit=5, approx=False):
+    if approx:
+        tails = rolling_quantiles(cumul_returns, window, [percentile, 1 - percentile])
+        left_tail, right_tail = np.abs(tails[percentile]), tails[1 - percentile]
+    else:
+        left_tail = np.abs(cumul_returns.rolling(window).quantile(percentile))
+        right_tail = cumul_returns.rolling(window).quantile(1-percentile)
     np.seterr(all='ignore')
     tail = np.maximum(np.minimum(right_tail / left_tail,limit),-limit)
     return tail
 
 
-def expanding_tail_ratio(cumul_returns, percentile=0.05,limit=5):
-    left_tail = np.abs(cumul_returns.expanding().quantile(percentile))
-    right_tail = cumul_returns.expanding().quantile(1 - percentile)
+def expanding_tail_ratio(cumul_returns, percentile=0.05,limit=5, approx=False):
+    if approx:
+        tails = expanding_quantiles(cumul_returns, [percentile, 1 - percentile])
+        left_tail, right_tail = np.abs(tails[percentile]), tails[1 - percentile]
+    else:
+        left_tail = np.abs(cumul_returns.expanding().quantile(percentile))
+        right_tail = cumul_returns.expanding().quantile(1 - percentile)
     np.seterr(all='ignore')
     tail = np.maximum(np.minimum(right_tail / left_tail,limit),-limit)
     return tail
@@ -97,6 +106,135 @@ def robustness_score(grit, csr, sqn):
     return score
 
 
+def _window_total(values, window):
+    """trailing sums of `window` bars from one cumulative sum, NaN until `window` bars exist"""
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    res = np.full(len(values), np.nan)
+    res[window - 1:] = csum[window:] - csum[:-window]
+    return res
+
+
+def expanding_win_rate(returns):
+    """share of bars so far with a positive return, NaN until the first non-null return"""
+    r = returns.to_numpy(dtype=float)
+    wins = np.cumsum(r > 0)
+    res = wins / np.arange(1, len(r) + 1)
+    res[np.cumsum(~np.isnan(r)) == 0] = np.nan
+    return pd.Series(res, index=returns.index)
+
+
+def rolling_win_rate(returns, window):
+    """share of the last `window` bars with a positive return, NaN if the window holds a null return"""
+    r = returns.to_numpy(dtype=float)
+    wins = _window_total((r > 0).astype(float), window)
+    full = _window_total((~np.isnan(r)).astype(float), window) == window
+    return pd.Series(np.where(full, wins / window, np.nan), index=returns.index)
+
+
+class StatsReport:
+    """
+    Computes every Stats metric in one pass over a single set of log returns.
+
+    Sums, counts, running peaks and quantiles are each computed once and shared by the metrics that
+    depend on them (profits feed profit ratio, avg win and expectancy; expectancy feeds t-stat; and so on),
+    instead of each Stats method recomputing its inputs.
+
+    Attributes:
+    - returns (pd.Series): Log returns of the strategy.
+    - trade_count (pd.Series): Running trade count.
+    - window (int, optional): Rolling window; None for expanding (whole-history) metrics.
+    - r_f (float): Risk-free return used by the sharpe ratio.
+    - approx (bool): Use approximate quantiles for the tail ratio.
+    """
+    def __init__(self, returns: pd.Series, trade_count: pd.Series, window=None, r_f=0.00001, approx=False):
+        self.returns = returns
+        self.trade_count = trade_count
+        self.window = window
+        self.r_f = r_f
+        self.approx = approx
+
+    def _total(self, values):
+        """expanding or trailing-window sum (NaN-skipping) and the matching count of non-null bars"""
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+        if self.window is None:
+            count = np.cumsum(valid).astype(float)
+            total = np.where(count > 0, np.cumsum(filled), np.nan)
+        else:
+            count = _window_total(valid.astype(float), self.window)
+            total = np.where(count == self.window, _window_total(filled, self.window), np.nan)
+        return total, count
+
+    def compute(self) -> pd.DataFrame:
+        index = self.returns.index
+        window = self.window
+        r = self.returns.to_numpy(dtype=float)
+        metrics = {'returns': r}
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # mean and population std from shared first and second moments
+            sum_r, count = self._total(r)
+            sum_r2, _ = self._total(r * r)
+            mean = sum_r / count
+            std = np.sqrt(np.maximum(sum_r2 / count - mean * mean, 0.0))
+            metrics['sharpe'] = (mean - self.r_f) / std
+
+            if window is None:
+                peak = np.fmax.accumulate(r)
+            else:
+                peak = self.returns.rolling(window).max().to_numpy()
+            ulcer = np.sqrt(self._total((r - peak) ** 2)[0])
+            metrics['grit'] = r / ulcer
+
+            profits = pd.Series(self._total(np.where(r < 0, 0.0, r))[0], index=index).ffill()
+            losses = pd.Series(self._total(np.where(r > 0, 0.0, r))[0], index=index).ffill()
+            metrics['profits'] = profits.to_numpy()
+            metrics['losses'] = losses.to_numpy()
+            pr = profit_ratio(profits, losses)
+            metrics['profit_ratio'] = pr.to_numpy()
+
+            if window is None:
+                tr = expanding_tail_ratio(self.returns, approx=self.approx)
+            else:
+                tr = rolling_tail_ratio(self.returns, window, approx=self.approx)
+            csr = common_sense_ratio(pr, tr)
+            metrics['tail_ratio'] = tr.to_numpy()
+            metrics['common_sense_ratio'] = csr.to_numpy()
+
+            wins = (r > 0).astype(float)
+            if window is None:
+                win_rate = np.cumsum(wins) / np.arange(1, len(r) + 1)
+                win_rate[count == 0] = np.nan
+                # average per non-zero bar, only defined on bars where the return is non-zero (or null)
+                nonzero = np.cumsum(~np.isnan(r) & (r != 0)).astype(float)
+                on_nonzero = np.isnan(r) | (r != 0)
+                avg_win = np.where(on_nonzero, profits.to_numpy() / nonzero, np.nan)
+                avg_loss = np.where(on_nonzero, losses.to_numpy() / nonzero, np.nan)
+                signal_count = self.trade_count
+            else:
+                win_rate = np.where(count == window, _window_total(wins, window) / window, np.nan)
+                avg_win = profits.to_numpy() / window
+                avg_loss = losses.to_numpy() / window
+                signal_count = self.trade_count.diff(window)
+            metrics['win_rate'] = win_rate
+            metrics['avg_win'] = avg_win
+            metrics['avg_loss'] = avg_loss
+
+            edge = pd.Series(expectancy(win_rate, avg_win, avg_loss), index=index)
+            sqn = t_stat(signal_count, edge)
+            metrics['expectancy'] = edge.to_numpy()
+            metrics['signal_count'] = signal_count.to_numpy()
+            metrics['t_stat'] = sqn.to_numpy()
+            grit = pd.Series(metrics['grit'], index=index)
+            try:
+                metrics['robustness_score'] = robustness_score(grit, csr, sqn).to_numpy()
+            except IndexError:
+                # one of the inputs is never defined, e.g. no trades
+                metrics['robustness_score'] = np.full(len(r), np.nan)
+
+        return pd.DataFrame(metrics, index=index)
+
+
 class Stats:
     def __init__(self, strategy):
         self.strategy = strategy
@@ -104,6 +242,8 @@ class Stats:
         self.price = strategy.price.close 
         self.trade_count = strategy.price.trade_count
         self.signal = strategy.price.signal
+        # price and signal are fixed once applied, so log returns are computed once and shared by every metric
+        self._log_returns = np.log(self.price / self.price.shift(1)) * self.signal
 
     def sharpe(self, r_f=0.00001, window=None):
         if window is None:
@@ -136,15 +276,16 @@ class Stats:
     def profit_ratio(self, window=None):
         return profit_ratio(self.profits(window), self.losses(window))
 
-    def tail_ratio(self, window=None):
+    def tail_ratio(self, window=None, approx=False):
+        """approx: use log-bucketed histogram quantiles (1% value / 1% rank error, see `quantile`) instead of exact ones"""
         if window is None:
-            res = expanding_tail_ratio(self.returns)
+            res = expanding_tail_ratio(self.returns, approx=approx)
         else:
-            res = rolling_tail_ratio(self.returns, window)
+            res = rolling_tail_ratio(self.returns, window, approx=approx)
         return res
 
-    def common_sense_ratio(self, window=None):
-        return common_sense_ratio(self.profit_ratio(window), self.tail_ratio(window))
+    def common_sense_ratio(self, window=None, approx=False):
+        return common_sense_ratio(self.profit_ratio(window), self.tail_ratio(window, approx=approx))
 
     def expectancy(self, window=None):
         return expectancy(self.win_rate(window), self.avg_win(window), self.avg_loss(window))
@@ -180,11 +321,11 @@ class Stats:
         # use log returns on purpose
         # arithmentic: self.price.pct_change()
         # TODO Shift signal to avoid look-ahead bias?
-        return np.log(self.price / self.price.shift(1)) * self.signal
+        return self._log_returns.copy()
     
     @property
     def log_returns(self):
-        return np.log(self.price / self.price.shift(1)) * self.signal
+        return self._log_returns.copy()
     
     def cumulative_log_returns(self, start=None):
         returns = self.log_returns
@@ -202,7 +343,27 @@ class Stats:
     
     def win_rate(self, window=None):
         if window is None:
-            res = self.returns.expanding().apply(lambda x: (x > 0).sum() / len(x))
+            res = expanding_win_rate(self.returns)
         else:
-            res = self.returns.rolling(window).apply(lambda x: (x > 0).sum() / len(x))
-        return res
\ No newline at end of file
+            res = rolling_win_rate(self.returns, window)
+        return res
+
+    def report(self, window=None, r_f=0.00001, approx=False) -> pd.DataFrame:
+        """every metric as one column of a single frame, computed in one pass"""
+        return StatsReport(self._log_returns, self.trade_count, window=window, r_f=r_f, approx=approx).compute()
+
+    def summary(self) -> dict:
+        """final value of each whole-history metric, one row of a sweep or report table"""
+        def last(series):
+            series = pd.Series(series).dropna()
+            return series.iloc[-1] if len(series) else np.nan
+
+        return {
+            'total_return': last(self.cumulative_log_returns()),
+            'sharpe': last(self.sharpe()),
+            'grit': last(self.grit()),
+            'profit_ratio': last(self.profit_ratio()),
+            'tail_ratio': last(self.tail_ratio()),
+            'common_sense_ratio': last(self.common_sense_ratio()),
+            'trades': last(self.trade_count),
+        }
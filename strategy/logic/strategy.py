@@ -2,6 +2,7 @@ from abc import ABC
 from .stats import Stats
 from .indicator import Indicator
 import pandas as pd
+import numpy as np
 
 # util
 def regime_ranges(signal):
@@ -122,14 +123,38 @@ class Strategy(Indicator, ABC):
         """
     
     def apply_signals(self):
+        """
+        Writes `signal` and `trade_count` columns onto the price frame from the signal log in one pass.
+
+        Regimes from `regime_ranges` never overlap, so adding each log row's id at its start bar and
+        subtracting it after its end bar, then taking the cumulative sum, marks which log row owns each bar.
+        """
         self._price = pd.DataFrame(self._price)
-        for i, signal in self.log.iterrows():
+        log = self.log
+        if self._has_warmup:
             # skip first signal, counted as warmup
-            if self._has_warmup and i == 0:
-                continue
-            self._price = Signal(signal).apply(self.price, i+1)
-        self._price['signal'] = self._price['signal'].fillna(0)
-        
+            log = log.loc[log.index != 0]
+
+        index = self._price.index
+        n = len(index)
+        starts = index.searchsorted(log.start.to_numpy(), side='left')
+        stops = index.searchsorted(log.end.to_numpy(), side='right')
+        keep = stops > starts
+        ids = np.arange(1, len(log) + 1)[keep]
+
+        owner = np.zeros(n + 1, dtype=np.int64)
+        np.add.at(owner, starts[keep], ids)
+        np.add.at(owner, stops[keep], -ids)
+        owner = np.cumsum(owner[:-1])
+        in_trade = owner > 0
+
+        signal = np.zeros(n)
+        signal[in_trade] = log.signal.to_numpy(dtype=float)[owner[in_trade] - 1]
+        trade_count = np.full(n, np.nan)
+        trade_count[in_trade] = (log.index.to_numpy() + 1)[owner[in_trade] - 1]
+        self._price['signal'] = signal
+        self._price['trade_count'] = trade_count
+
         return self._price
 
 
@@ -0,0 +1,256 @@
+"""
+Vectorized indicator evaluation over a panel of aligned symbols.
+
+A panel holds close/high/low/volume as (symbols x bars) arrays on a shared time index, NaN
+where a symbol has no bar: before its history starts, and inside it wherever the source
+skipped a bar (Coinbase omits candles for intervals without trades). The panel indicators
+take their windows over each symbol's own bars (`own_bars`), so a gap neither shortens a
+window nor turns it into NaN; bars a symbol does not have are NaN in the result.
+
+Classes:
+- Panel: Aligned (symbols x bars) price arrays built from per-symbol price frames.
+
+Functions:
+- rolling_max: Rolling max along the bar axis.
+- rolling_min: Rolling min along the bar axis.
+- own_bars: Runs a bar-axis function over each symbol's own bars, skipping missing ones.
+- move_avg: Panel equivalent of MoveAvg.
+- trading_range: Panel equivalent of TradingRange.
+- trading_range_signal: Trading range zone (0-4) of each close.
+- atr_volume_breakout: Panel equivalent of ATRVolumeBreakout.
+"""
+
+import typing as t
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from . import indicators
+from .indicators import rolling_mean
+
+
+def _rolling_extreme(values, window, ufunc):
+    """
+    van Herk/Gil-Werman rolling extreme along the last axis: O(bars) regardless of window size.
+    Each window spans the suffix of one block and the prefix of the next, so it is
+    the extreme of a block-suffix accumulation and a block-prefix accumulation.
+    """
+    values = np.asarray(values, dtype=float)
+    n = values.shape[-1]
+    res = np.full(values.shape, np.nan)
+    if window > n:
+        return res
+    n_blocks = -(-n // window)
+    pad = [(0, 0)] * (values.ndim - 1) + [(0, n_blocks * window - n)]
+    blocks = np.pad(values, pad, constant_values=np.nan).reshape(values.shape[:-1] + (n_blocks, window))
+    prefix = ufunc.accumulate(blocks, axis=-1).reshape(values.shape[:-1] + (-1,))[..., :n]
+    suffix = ufunc.accumulate(blocks[..., ::-1], axis=-1)[..., ::-1].reshape(values.shape[:-1] + (-1,))[..., :n]
+    # np.maximum/np.minimum propagate NaN, so any window holding a NaN is NaN, like pandas
+    res[..., window - 1:] = ufunc(suffix[..., :n - window + 1], prefix[..., window - 1:])
+    return res
+
+
+def rolling_max(values, window):
+    """
+    Rolling max along the last axis, matching pandas `rolling(window).max()`.
+
+    Parameters:
+    - values (np.ndarray): A series or (symbols x bars) panel.
+    - window (int): The rolling window size.
+
+    Returns:
+    - np.ndarray: The rolling max, same shape as `values`.
+    """
+    return _rolling_extreme(values, window, np.maximum)
+
+
+def rolling_min(values, window):
+    """
+    Rolling min along the last axis, matching pandas `rolling(window).min()`.
+
+    Parameters:
+    - values (np.ndarray): A series or (symbols x bars) panel.
+    - window (int): The rolling window size.
+
+    Returns:
+    - np.ndarray: The rolling min, same shape as `values`.
+    """
+    return _rolling_extreme(values, window, np.minimum)
+
+
+def own_bars(func, *arrays, has_bar=None, **kwargs):
+    """
+    Runs a bar-axis function over each symbol's own bars. In every row, the bars the symbol has are
+    moved to the front in order, `func` runs on the compressed rows, and each result is moved back
+    to the bar it belongs to. Bars the symbol does not have are NaN in float results and 0 in
+    integer results.
+
+    Parameters:
+    - func (callable): Takes the compressed `arrays` (and `kwargs`); returns an array or a dict of arrays
+      of the same shape.
+    - arrays (np.ndarray): Series or (symbols x bars) panels of the same shape.
+    - has_bar (np.ndarray, optional): Where a symbol has a bar. Defaults to where the first array is not NaN.
+
+    Returns:
+    - np.ndarray | dict: What `func` returns, at the original bars.
+    """
+    arrays = [np.asarray(values, dtype=float) for values in arrays]
+    if has_bar is None:
+        has_bar = ~np.isnan(arrays[0])
+    # stable sort on "missing" keeps each row's own bars in order, ahead of the missing ones;
+    # `source` is the flat position each compressed value comes from and is scattered back to
+    order = np.argsort(~has_bar, axis=-1, kind='stable')
+    source = (order + np.arange(0, has_bar.size, has_bar.shape[-1]).reshape(has_bar.shape[:-1] + (1,))).ravel()
+    missing = ~has_bar.ravel()[source].reshape(has_bar.shape)
+    compressed = []
+    for values in arrays:
+        values = values.ravel()[source].reshape(has_bar.shape)
+        values[missing] = np.nan
+        compressed.append(values)
+    res = func(*compressed, **kwargs)
+
+    def expand(values):
+        values = np.asarray(values)
+        out = np.empty(values.shape, dtype=values.dtype)
+        out.ravel()[source] = values.ravel()
+        out[~has_bar] = np.nan if np.issubdtype(values.dtype, np.floating) else 0
+        return out
+
+    return {key: expand(values) for key, values in res.items()} if isinstance(res, dict) else expand(res)
+
+
+@dataclass
+class Panel:
+    """
+    Aligned (symbols x bars) price arrays.
+
+    Attributes:
+    - symbols (list[str]): Row labels.
+    - index (pd.Index): Shared bar index (column labels).
+    - close, high, low, volume (np.ndarray): (symbols x bars) float arrays, NaN where a symbol has no bar.
+    """
+    symbols: t.List[str]
+    index: pd.Index
+    close: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_frames(cls, frames: t.Dict[str, pd.DataFrame], time_col='Datetime'):
+        """
+        Aligns per-symbol price frames (as returned by `get_price_history`) on their union time index.
+
+        Parameters:
+        - frames (dict): Mapping of symbol to price DataFrame with close/high/low/volume columns.
+        - time_col (str, optional): Column holding the bar timestamp. Defaults to 'Datetime'.
+
+        Returns:
+        - Panel: The aligned panel.
+        """
+        frames = {symbol: frame for symbol, frame in frames.items() if not frame.empty}
+        symbols = list(frames.keys())
+        if not symbols:
+            empty = np.empty((0, 0))
+            return cls([], pd.Index([]), empty, empty, empty, empty)
+        long = pd.concat(
+            [frame.set_index(time_col)[['close', 'high', 'low', 'volume']] for frame in frames.values()],
+            keys=symbols, names=['symbol', time_col]
+        )
+        long = long[~long.index.duplicated(keep='last')]
+        wide = long.unstack(time_col).sort_index(axis=1, level=time_col).reindex(symbols)
+        index = wide['close'].columns
+        return cls(
+            symbols,
+            index,
+            *(wide[col].to_numpy(dtype=float) for col in ['close', 'high', 'low', 'volume'])
+        )
+
+    def to_frame(self, values) -> pd.DataFrame:
+        """Labels a (symbols x bars) result array with the panel's symbols and index."""
+        return pd.DataFrame(values, index=self.symbols, columns=self.index)
+
+    def last(self, values, offset=1) -> pd.Series:
+        """
+        Value of a (symbols x bars) result at each symbol's own `offset`-th last bar,
+        so symbols whose history ends early are not read as NaN.
+        """
+        if not self.symbols:
+            return pd.Series(dtype=float)
+        has_bar = ~np.isnan(self.close)
+        last_bar = self.close.shape[-1] - 1 - np.argmax(has_bar[:, ::-1], axis=-1)
+        bar = last_bar - (offset - 1)
+        res = np.where(bar >= 0, values[np.arange(len(self.symbols)), np.maximum(bar, 0)], np.nan)
+        return pd.Series(res, index=self.symbols)
+
+
+def move_avg(close, window=120):
+    """
+    Panel equivalent of MoveAvg.
+
+    Parameters:
+    - close (np.ndarray): (symbols x bars) close prices.
+    - window (int, optional): The rolling window size. Defaults to 120.
+
+    Returns:
+    - np.ndarray: The rolling mean per symbol.
+    """
+    return own_bars(rolling_mean, close, window=window)
+
+
+def trading_range(close, window=200, high_band_pct=.40, low_band_pct=.61):
+    """
+    Panel equivalent of TradingRange.
+
+    Parameters:
+    - close (np.ndarray): (symbols x bars) close prices.
+    - window (int, optional): The rolling window size. Defaults to 200.
+    - high_band_pct (float, optional): Position of the upper band within the range. Defaults to .40.
+    - low_band_pct (float, optional): Position of the lower band within the range. Defaults to .61.
+
+    Returns:
+    - dict: 'upper', 'lower', 'band_24', 'band_76', 'min' and 'max' arrays.
+    """
+    extremes = own_bars(lambda values: {'max': rolling_max(values, window), 'min': rolling_min(values, window)}, close)
+    r_max, r_min = extremes['max'], extremes['min']
+    r_range = r_max - r_min
+    return {
+        'upper': r_min + r_range * high_band_pct,
+        'lower': r_min + r_range * low_band_pct,
+        'band_24': r_min + r_range * .24,
+        'band_76': r_min + r_range * .76,
+        'min': r_min,
+        'max': r_max,
+    }
+
+
+def trading_range_signal(close, bands):
+    """
+    Trading range zone of each close, numbered like TradingRangePeak's `tr_signal`:
+    0 at or below the 24% band, then 1-4 for each band crossed up to the range max.
+
+    Parameters:
+    - close (np.ndarray): (symbols x bars) close prices.
+    - bands (dict): Output of `trading_range`.
+
+    Returns:
+    - np.ndarray: int8 zone per bar, 0 where the range is undefined.
+    """
+    edges = [bands['band_24'], bands['upper'], bands['lower'], bands['band_76'], bands['max']]
+    signal = np.zeros(close.shape, dtype=np.int8)
+    for zone, (low_edge, high_edge) in enumerate(zip(edges[:-1], edges[1:]), start=1):
+        signal[(close > low_edge) & (close <= high_edge)] = zone
+    return signal
+
+
+def atr_volume_breakout(high, low, close, volume, **kwargs):
+    """
+    Panel equivalent of ATRVolumeBreakout: `indicators.atr_volume_breakout` over each symbol's own bars.
+
+    Parameters:
+    - high, low, close, volume (np.ndarray): (symbols x bars) price and volume arrays.
+    - kwargs: Periods and thresholds, as in `indicators.atr_volume_breakout`.
+
+    Returns:
+    - dict: 'atr', 'atr_mean', 'vol_mean' and 'breakout_signal' arrays.
+    """
+    return own_bars(indicators.atr_volume_breakout, high, low, close, volume, has_bar=~np.isnan(close), **kwargs)
@@ -0,0 +1,159 @@
+"""
+Vectorized multi-asset portfolio backtests on a Panel.
+
+Signals are a (symbols x bars) matrix using the Stats convention: the signal at a bar is the
+position held over the move from the previous close into that bar's close. Each bar the portfolio
+is rebalanced to target weights (the signals scaled to a gross exposure of 1), paying `cost` per
+unit of turnover. Symbols without a bar earn nothing and hold no weight.
+
+Bars are processed in chunks, carrying only the previous bar's weights, positions and closes
+between chunks, so memory stays bounded for wide panels (500 symbols x 50k bars) while every
+chunk is pure array operations.
+
+Classes:
+- PortfolioResult: Weights, turnover, returns and equity of a backtest.
+
+Functions:
+- signal_panel(strategy_factory, panel): Stacks a VectorStrategy's signal for every symbol of a panel.
+- backtest(panel, signal, scores, cost, allow_short, chunk): Runs the portfolio backtest.
+
+Usage:
+>>> p = Panel.from_frames(frames)
+>>> signal = signal_panel(lambda: XOverStrat(slow=200, fast=50), p)
+>>> res = backtest(p, signal, cost=0.001)
+>>> res.report().sharpe.iloc[-1]
+"""
+
+import typing as t
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from .panel import Panel
+from .logic.stats import StatsReport
+
+
+@dataclass
+class PortfolioResult:
+    """
+    Attributes:
+    - symbols (list[str]): Row labels of `weights`.
+    - weights (np.ndarray): (symbols x bars) target weight held over each bar.
+    - turnover (pd.Series): Sum of absolute weight changes at each bar.
+    - returns (pd.Series): Portfolio simple return per bar, after costs.
+    - equity (pd.Series): Cumulative portfolio return.
+    - trade_count (pd.Series): Running count of positions opened across all symbols.
+    """
+    symbols: t.List[str]
+    weights: np.ndarray
+    turnover: pd.Series
+    returns: pd.Series
+    equity: pd.Series
+    trade_count: pd.Series
+
+    @property
+    def log_returns(self) -> pd.Series:
+        return np.log1p(self.returns)
+
+    def report(self, window=None, r_f=0.00001) -> pd.DataFrame:
+        """Stats metrics of the portfolio, one column each, as `Stats.report` gives for one symbol"""
+        return StatsReport(self.log_returns, self.trade_count, window=window, r_f=r_f).compute()
+
+
+def signal_panel(strategy_factory: t.Callable, panel: Panel) -> np.ndarray:
+    """
+    Runs a VectorStrategy on each symbol's own history and stacks the applied signals.
+
+    Parameters:
+    - strategy_factory (callable): Returns a fresh strategy, e.g. `lambda: XOverStrat(slow=200, fast=50)`.
+    - panel (Panel): The aligned price panel.
+
+    Returns:
+    - np.ndarray: (symbols x bars) signal, 0 where a symbol has no bar or no position.
+    """
+    signal = np.zeros(panel.close.shape)
+    columns = {'close': panel.close, 'high': panel.high, 'low': panel.low, 'volume': panel.volume}
+    for row in range(len(panel.symbols)):
+        has_bar = ~np.isnan(panel.close[row])
+        price = pd.DataFrame({name: values[row, has_bar] for name, values in columns.items()})
+        strategy = strategy_factory()
+        strategy.update(price)
+        signal[row, has_bar] = strategy.apply_signals().signal.to_numpy(dtype=float)
+    return signal
+
+
+def backtest(panel: Panel, signal, scores=None, cost=0.0, allow_short=True, chunk=4096) -> PortfolioResult:
+    """
+    Backtests a rebalanced portfolio of the panel's symbols.
+
+    Parameters:
+    - panel (Panel): The aligned price panel.
+    - signal (np.ndarray): (symbols x bars) position direction, -1/0/1 (or any size).
+    - scores (np.ndarray, optional): Per-symbol (symbols,) or per-bar (symbols x bars) sizing, e.g. scanner
+      ranks. Defaults to equal weight across the active positions.
+    - cost (float, optional): Cost per unit of turnover (0.001 = 10bps). Defaults to 0.
+    - allow_short (bool, optional): Keep short signals; if False they are treated as flat. Defaults to True.
+    - chunk (int, optional): Bars processed per chunk. Defaults to 4096.
+
+    Returns:
+    - PortfolioResult: The backtest result.
+    """
+    close = panel.close
+    n_symbols, n_bars = close.shape
+    signal = np.broadcast_to(np.asarray(signal, dtype=float), close.shape)
+    if scores is not None:
+        scores = np.asarray(scores, dtype=float)
+        if scores.ndim == 1:
+            scores = scores[:, None]
+        scores = np.broadcast_to(scores, close.shape)
+
+    weights = np.zeros(close.shape)
+    turnover = np.zeros(n_bars)
+    returns = np.zeros(n_bars)
+    entries = np.zeros(n_bars)
+    prev_weight = np.zeros(n_symbols)
+    prev_position = np.zeros(n_symbols)
+    prev_close = np.full(n_symbols, np.nan)
+
+    for start in range(0, n_bars, chunk):
+        stop = min(start + chunk, n_bars)
+        px = close[:, start:stop]
+        has_bar = ~np.isnan(px)
+
+        position = np.nan_to_num(signal[:, start:stop])
+        if not allow_short:
+            position = np.maximum(position, 0.0)
+        position = np.where(has_bar, position, 0.0)
+
+        raw = position if scores is None else position * np.nan_to_num(scores[:, start:stop])
+        gross = np.abs(raw).sum(axis=0)
+        w = np.divide(raw, gross, out=np.zeros_like(raw), where=gross > 0)
+        weights[:, start:stop] = w
+
+        # bar return from the symbol's last known close, carried across chunks and gaps;
+        # no return on a symbol's first bar
+        filled = pd.DataFrame(np.concatenate([prev_close[:, None], px], axis=1).T).ffill().to_numpy().T
+        prior = filled[:, :-1]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            bar_return = np.nan_to_num(px / prior - 1.0, nan=0.0, posinf=0.0, neginf=0.0)
+
+        prior_w = np.concatenate([prev_weight[:, None], w[:, :-1]], axis=1)
+        turnover[start:stop] = np.abs(w - prior_w).sum(axis=0)
+        returns[start:stop] = (w * bar_return).sum(axis=0) - cost * turnover[start:stop]
+
+        prior_position = np.concatenate([prev_position[:, None], position[:, :-1]], axis=1)
+        entries[start:stop] = ((position != 0) & (np.sign(position) != np.sign(prior_position))).sum(axis=0)
+
+        prev_weight = w[:, -1]
+        prev_position = position[:, -1]
+        prev_close = filled[:, -1]
+
+    index = panel.index
+    returns = pd.Series(returns, index=index)
+    return PortfolioResult(
+        symbols=list(panel.symbols),
+        weights=weights,
+        turnover=pd.Series(turnover, index=index),
+        returns=returns,
+        equity=(1 + returns).cumprod() - 1,
+        trade_count=pd.Series(np.cumsum(entries), index=index),
+    )
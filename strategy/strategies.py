@@ -10,7 +10,7 @@ class XOverStrat(VectorStrategy):
 
     def __init__(self, slow: int, fast: int):
         super().__init__(has_warmup=True)
-        self._xover = self._indicators.add(MoveAvgCross(slow, fast))
+        self._xover = self._indicators.add(MoveAvgCross(fast, slow))
 
     def _update(self, value):
         """value set to 1 when fast > slow, -1 slow > fast"""
@@ -53,12 +53,13 @@ class BollingerMeanReversion(VectorStrategy):
         """
         value set to 1 when price > upper band, -1 price < lower band
         """
-        res = value.copy()
+        close = value.close
+        res = close.copy()
         res.loc[
-            (value > self._bb.value.upper)
+            (close > self._bb.value.upper)
         ] = -1
         res.loc[
-            (value < self._bb.value.lower)
+            (close < self._bb.value.lower)
         ] = 1
         self._value = res.shift()
 
@@ -91,18 +92,19 @@ class TradingRangeBreakout(VectorStrategy):
         return self._trading_range
 
     def _update(self, value):
-        res = value.copy()
+        close = value.close
+        res = close.copy()
         # Set res to 1 if value is above the upper band
         res.loc[
-            (value > self._trading_range.value.upper)
+            (close > self._trading_range.value.upper)
         ] = 1
         # Set res to -1 if value is below the lower band
         res.loc[
-            (value < self._trading_range.value.lower)
+            (close < self._trading_range.value.lower)
         ] = -1
         # Set res to 0 if value is between the upper and lower bands
         res.loc[
-            (value <= self._trading_range.value.upper) & (value >= self._trading_range.value.lower)
+            (close <= self._trading_range.value.upper) & (close >= self._trading_range.value.lower)
         ] = 0
         self._value = res
 
@@ -0,0 +1,357 @@
+"""
+Event-driven strategy runner for live bars.
+
+VectorStrategy recomputes its whole signal series and signal log on every update. The classes here
+instead keep incremental indicator state, so each new bar costs O(1) (amortized for rolling extremes)
+regardless of history length, and trades are appended to a log as they close instead of being
+rebuilt with `regime_ranges`. One runner holds a strategy per symbol, so hundreds of symbols can be
+driven from one polling loop over the 1-minute feed.
+
+The stream strategies produce the same signal bar for bar as their VectorStrategy counterparts and
+the same trades as `regime_ranges` over that signal (bars that are neither long nor short are 0).
+
+Classes:
+- RollingMean, RollingStd, RollingMax, RollingMin: O(1) per-bar rolling statistics.
+- TradeLog: Append-only log of closed trades plus the open one.
+- StreamStrategy: Base class of bar-at-a-time strategies.
+- StreamXOver, StreamBollingerMeanReversion, StreamTradingRangeBreakout: Streaming XOverStrat,
+  BollingerMeanReversion and TradingRangeBreakout.
+- SignalEvent: A trade opened or closed on one symbol.
+- StreamRunner: Routes bars to per-symbol strategies and emits signal events.
+
+Usage:
+>>> runner = StreamRunner(lambda: StreamXOver(slow=200, fast=50), on_event=print)
+>>> runner.on_frame(latest_bars)  # long frame of closed bars with symbol/Datetime/close columns
+"""
+
+import math
+import typing as t
+from collections import deque
+from dataclasses import dataclass
+import pandas as pd
+
+
+class RollingMean:
+    """Rolling mean over the last `window` values, NaN until the window is full."""
+    def __init__(self, window: int):
+        assert window > 0
+        self.window = window
+        self._values = deque(maxlen=window)
+        self._sum = 0.0
+        self._count = 0
+
+    def update(self, x: float) -> float:
+        if len(self._values) == self.window:
+            self._sum -= self._values[0]
+        self._values.append(x)
+        self._sum += x
+        self._count += 1
+        # re-sum once per window so rounding error cannot accumulate, still O(1) amortized
+        if self._count % self.window == 0:
+            self._sum = math.fsum(self._values)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self._sum / self.window if len(self._values) == self.window else math.nan
+
+
+class RollingStd:
+    """Rolling standard deviation (pandas' ddof=1 by default), updated with a sliding Welford step."""
+    def __init__(self, window: int, ddof=1):
+        assert window > ddof
+        self.window = window
+        self.ddof = ddof
+        self._values = deque(maxlen=window)
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, x: float) -> float:
+        n = len(self._values)
+        if n < self.window:
+            self._values.append(x)
+            delta = x - self._mean
+            self._mean += delta / (n + 1)
+            self._m2 += delta * (x - self._mean)
+        else:
+            old = self._values[0]
+            self._values.append(x)
+            mean = self._mean + (x - old) / self.window
+            self._m2 += (x - old) * (x - mean + old - self._mean)
+            self._mean = mean
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if len(self._values) < self.window:
+            return math.nan
+        return math.sqrt(max(self._m2, 0.0) / (self.window - self.ddof))
+
+
+class _RollingExtreme:
+    """monotonic deque of (bar, value); the front is the extreme of the window"""
+    def __init__(self, window: int):
+        assert window > 0
+        self.window = window
+        self._deque = deque()
+        self._bar = -1
+
+    def _dominates(self, a, b) -> bool:
+        raise NotImplementedError
+
+    def update(self, x: float) -> float:
+        self._bar += 1
+        while self._deque and not self._dominates(self._deque[-1][1], x):
+            self._deque.pop()
+        self._deque.append((self._bar, x))
+        if self._deque[0][0] <= self._bar - self.window:
+            self._deque.popleft()
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self._deque[0][1] if self._bar >= self.window - 1 else math.nan
+
+
+class RollingMax(_RollingExtreme):
+    """Rolling max, NaN until the window is full."""
+    def _dominates(self, a, b):
+        return a > b
+
+
+class RollingMin(_RollingExtreme):
+    """Rolling min, NaN until the window is full."""
+    def _dominates(self, a, b):
+        return a < b
+
+
+class TradeLog:
+    """
+    Append-only trade log with the `regime_ranges` columns (start, end, signal).
+
+    Closed trades are appended once and never rewritten; only the open trade's end moves.
+    Trade ids count from 0 in the order trades open, like the index of `regime_ranges`.
+    """
+    def __init__(self):
+        self.closed: t.List[dict] = []
+        self.open: t.Optional[dict] = None
+
+    def update(self, time, signal) -> t.Tuple[t.Optional[dict], t.Optional[dict]]:
+        """
+        Records the signal of one bar.
+
+        Returns:
+        - tuple: (trade closed by this bar or None, trade opened by this bar or None).
+        """
+        side = signal if signal in (1, -1) else 0
+        if self.open is not None and side == self.open['signal']:
+            self.open['end'] = time
+            return None, None
+        closed = self.open
+        if closed is not None:
+            self.closed.append(closed)
+        self.open = None
+        if side != 0:
+            self.open = {'start': time, 'end': time, 'signal': side}
+        return closed, self.open
+
+    @property
+    def trade_count(self) -> int:
+        return len(self.closed) + (self.open is not None)
+
+    def to_frame(self) -> pd.DataFrame:
+        """the log as a DataFrame, including the open trade"""
+        rows = self.closed + ([self.open] if self.open is not None else [])
+        return pd.DataFrame(rows, columns=['start', 'end', 'signal'])
+
+
+class StreamStrategy:
+    """
+    Bar-at-a-time strategy. Subclasses implement `_on_bar(bar)` returning the signal for that bar.
+
+    Attributes:
+    - has_warmup (bool): The first trade is counted as warmup, like VectorStrategy's `has_warmup`:
+      it is logged but raises no event, since it did not start from a real signal change.
+    - log (TradeLog): The trades so far.
+    - signal (float): Signal of the last bar.
+    """
+    def __init__(self, has_warmup=False):
+        self.has_warmup = has_warmup
+        self.log = TradeLog()
+        self.signal = math.nan
+
+    def _on_bar(self, bar) -> float:
+        raise NotImplementedError
+
+    def on_bar(self, bar, time=None):
+        """
+        Feeds one closed bar.
+
+        Parameters:
+        - bar (Mapping): The bar's close (and high/low/volume if the strategy uses them).
+        - time (optional): Bar label recorded in the trade log.
+
+        Returns:
+        - tuple: (trade closed by this bar or None, trade opened by this bar or None).
+        """
+        self.signal = self._on_bar(bar)
+        return self.log.update(time, self.signal)
+
+
+class StreamXOver(StreamStrategy):
+    """XOverStrat: 1 when the fast mean was above the slow mean on the previous bar, -1 when below."""
+    def __init__(self, slow: int, fast: int):
+        assert fast < slow
+        super().__init__(has_warmup=True)
+        self._slow = RollingMean(slow)
+        self._fast = RollingMean(fast)
+        self._previous = math.nan
+
+    def _on_bar(self, bar):
+        signal = self._previous
+        diff = self._fast.update(bar['close']) - self._slow.update(bar['close'])
+        self._previous = math.copysign(1.0, diff) if diff != 0 and not math.isnan(diff) else diff
+        return signal
+
+
+class StreamBollingerMeanReversion(StreamStrategy):
+    """BollingerMeanReversion: 1 when the previous close was below the lower band, -1 above the upper band."""
+    def __init__(self, window: int, n_std: int):
+        super().__init__(has_warmup=True)
+        self._n_std = n_std
+        self._middle = RollingMean(window)
+        self._std = RollingStd(window)
+        self._previous = math.nan
+
+    def _on_bar(self, bar):
+        signal = self._previous
+        close = bar['close']
+        middle = self._middle.update(close)
+        std = self._std.update(close) * self._n_std
+        if close > middle + std:
+            self._previous = -1
+        elif close < middle - std:
+            self._previous = 1
+        else:
+            self._previous = 0
+        return signal
+
+
+class StreamTradingRangeBreakout(StreamStrategy):
+    """TradingRangeBreakout: 1 above the range's upper band, -1 below its lower band, 0 between."""
+    def __init__(self, high_band_pct, low_band_pct, window=233):
+        super().__init__(has_warmup=True)
+        self._high_band_pct = high_band_pct
+        self._low_band_pct = low_band_pct
+        self._max = RollingMax(window)
+        self._min = RollingMin(window)
+
+    def _on_bar(self, bar):
+        close = bar['close']
+        r_max = self._max.update(close)
+        r_min = self._min.update(close)
+        if math.isnan(r_max):
+            return 0
+        upper = r_min + (r_max - r_min) * self._high_band_pct
+        lower = r_min + (r_max - r_min) * self._low_band_pct
+        # the 40% "upper" band sits below the 61% "lower" band, so a close between them is both
+        # above upper and below lower; TradingRangeBreakout resolves that overlap as short
+        if close < lower:
+            return -1
+        if close > upper:
+            return 1
+        return 0
+
+
+@dataclass
+class SignalEvent:
+    """
+    Attributes:
+    - symbol (str): The symbol whose position changed.
+    - time: Label of the bar that changed it.
+    - signal (int): New position: 1 long, -1 short, 0 flat.
+    - previous (int): Position before this bar.
+    - trade_id (int): Id of the trade opened (or, when going flat, closed) by this bar.
+    """
+    symbol: str
+    time: t.Any
+    signal: int
+    previous: int
+    trade_id: int
+
+
+class StreamRunner:
+    """
+    Feeds bars to one strategy per symbol and emits a SignalEvent whenever a position changes.
+
+    Bars at or before a symbol's last seen time are ignored, so overlapping polls of the same
+    candles can be fed as they arrive. Only closed bars should be fed; a still-forming candle
+    would be counted as a finished bar.
+
+    Attributes:
+    - strategy_factory (callable): Returns a fresh StreamStrategy for a new symbol.
+    - on_event (callable, optional): Called with each SignalEvent.
+    - strategies (dict): Strategy of each symbol seen so far.
+    """
+    def __init__(self, strategy_factory: t.Callable[[], StreamStrategy], on_event: t.Optional[t.Callable] = None):
+        self.strategy_factory = strategy_factory
+        self.on_event = on_event
+        self.strategies: t.Dict[str, StreamStrategy] = {}
+        self._last_time: t.Dict[str, t.Any] = {}
+
+    def on_bar(self, symbol: str, bar, time=None) -> t.Optional[SignalEvent]:
+        """
+        Feeds one closed bar of one symbol.
+
+        Returns:
+        - SignalEvent | None: The position change caused by this bar, if any.
+        """
+        if time is not None:
+            last = self._last_time.get(symbol)
+            if last is not None and time <= last:
+                return None
+            self._last_time[symbol] = time
+        strategy = self.strategies.get(symbol)
+        if strategy is None:
+            strategy = self.strategies[symbol] = self.strategy_factory()
+
+        closed, opened = strategy.on_bar(bar, time)
+        if closed is None and opened is None:
+            return None
+        trade_id = strategy.log.trade_count - 1 if opened is not None else len(strategy.log.closed) - 1
+        if strategy.has_warmup and trade_id == 0:
+            return None
+        event = SignalEvent(
+            symbol=symbol,
+            time=time,
+            signal=int(opened['signal']) if opened is not None else 0,
+            previous=int(closed['signal']) if closed is not None else 0,
+            trade_id=trade_id,
+        )
+        if self.on_event is not None:
+            self.on_event(event)
+        return event
+
+    def on_frame(self, bars: pd.DataFrame, symbol_col='symbol', time_col='Datetime') -> t.List[SignalEvent]:
+        """
+        Feeds a long frame of closed bars for many symbols, in time order.
+
+        Parameters:
+        - bars (pd.DataFrame): One row per (symbol, bar) with close (and optionally high/low/volume) columns.
+        - symbol_col (str, optional): Column holding the symbol. Defaults to 'symbol'.
+        - time_col (str, optional): Column holding the bar timestamp. Defaults to 'Datetime'.
+
+        Returns:
+        - list[SignalEvent]: The position changes, in the order they happened.
+        """
+        events = []
+        for bar in bars.sort_values(time_col, kind='stable').to_dict('records'):
+            event = self.on_bar(bar[symbol_col], bar, bar[time_col])
+            if event is not None:
+                events.append(event)
+        return events
+
+    def log(self, symbol: str) -> pd.DataFrame:
+        """trade log of one symbol"""
+        strategy = self.strategies.get(symbol)
+        return strategy.log.to_frame() if strategy is not None else TradeLog().to_frame()
@@ -0,0 +1,146 @@
+"""
+Parallel parameter sweeps for VectorStrategy subclasses.
+
+The price frame is copied once into shared memory; each worker process attaches to it when the
+pool starts and rebuilds the frame without copying, so a task only pickles the strategy class
+and one parameter combination. Results stream back as they finish.
+
+Functions:
+- parameter_grid(grid): Expands a dict of parameter lists into every combination.
+- shared_pool(price, processes): Process pool whose workers share one copy of the price frame.
+- iter_sweep(strategy_cls, grid, price, processes, chunksize): Yields one summary row per combination as it completes.
+- sweep(strategy_cls, grid, price, processes, chunksize): Runs the whole grid and returns one result table.
+
+Usage:
+>>> from strategy.strategies import XOverStrat
+>>> results = sweep(XOverStrat, {'slow': [100, 200], 'fast': [10, 20, 50]}, price)
+"""
+
+import contextlib
+import itertools
+import multiprocessing
+import os
+import typing as t
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from .logic.stats import Stats
+
+# per-worker state, set by _init_worker
+_worker_price: t.Optional[pd.DataFrame] = None
+_worker_shm: t.Optional[shared_memory.SharedMemory] = None
+
+
+def parameter_grid(grid: t.Dict[str, t.Iterable]) -> t.List[t.Dict[str, t.Any]]:
+    """
+    Expands a dict of parameter lists into every combination.
+
+    Parameters:
+    - grid (dict): Mapping of constructor argument name to the values to try.
+
+    Returns:
+    - list[dict]: One kwargs dict per combination.
+    """
+    names = list(grid.keys())
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def _share_price(price: pd.DataFrame):
+    """copy the numeric price columns into one shared (bars x columns) block"""
+    columns = [col for col in price.columns if pd.api.types.is_numeric_dtype(price[col])]
+    values = price[columns].to_numpy(dtype=np.float64)
+    shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf)[:] = values
+    return shm, values.shape, columns
+
+
+def _init_worker(shm_name, shape, columns, index):
+    global _worker_price, _worker_shm
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    values = np.ndarray(shape, dtype=np.float64, buffer=_worker_shm.buf)
+    values.flags.writeable = False
+    _worker_price = pd.DataFrame(values, index=index, columns=columns, copy=False)
+
+
+@contextlib.contextmanager
+def shared_pool(price: pd.DataFrame, processes=None):
+    """
+    Process pool whose workers see `price` as `sweep._worker_price`, backed by one shared-memory copy.
+
+    Parameters:
+    - price (pd.DataFrame): Price history; only numeric columns are shared.
+    - processes (int, optional): Worker count. Defaults to os.cpu_count().
+
+    Yields:
+    - multiprocessing.pool.Pool: The pool; the shared block is released when the context exits.
+    """
+    shm, shape, columns = _share_price(price)
+    try:
+        with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(shm.name, shape, columns, price.index)) as pool:
+            yield pool
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _run(task):
+    strategy_cls, params = task
+    row = dict(params)
+    try:
+        strategy = strategy_cls(**params)
+        strategy.update(_worker_price)
+        row.update(Stats(strategy).summary())
+    except Exception as e:
+        row['error'] = f'{type(e).__name__}: {e}'
+    return row
+
+
+def iter_sweep(strategy_cls, grid: t.Dict[str, t.Iterable], price, processes=None, chunksize=None) -> t.Iterator[dict]:
+    """
+    Runs every parameter combination across a process pool, yielding summary rows as they complete.
+
+    Parameters:
+    - strategy_cls (type): An importable VectorStrategy subclass.
+    - grid (dict): Mapping of constructor argument name to the values to try.
+    - price (pd.DataFrame | pd.Series): Price history with a `close` column (a Series is treated as close).
+    - processes (int, optional): Worker count. Defaults to os.cpu_count().
+    - chunksize (int, optional): Combinations per task. Defaults to spreading the grid over ~4 tasks per worker.
+
+    Yields:
+    - dict: The parameters plus `Stats.summary()` for one combination, or an `error` entry if it failed.
+    """
+    if isinstance(price, pd.Series):
+        price = price.to_frame('close')
+    combos = parameter_grid(grid)
+    processes = processes or os.cpu_count() or 1
+    chunksize = chunksize or max(1, len(combos) // (processes * 4))
+
+    with shared_pool(price, processes) as pool:
+        tasks = ((strategy_cls, params) for params in combos)
+        for row in pool.imap_unordered(_run, tasks, chunksize=chunksize):
+            yield row
+
+
+def sweep(strategy_cls, grid: t.Dict[str, t.Iterable], price, processes=None, chunksize=None) -> pd.DataFrame:
+    """
+    Runs every parameter combination and collects the summaries into one table.
+
+    Parameters:
+    - strategy_cls (type): An importable VectorStrategy subclass.
+    - grid (dict): Mapping of constructor argument name to the values to try.
+    - price (pd.DataFrame | pd.Series): Price history with a `close` column.
+    - processes (int, optional): Worker count. Defaults to os.cpu_count().
+    - chunksize (int, optional): Combinations per task.
+
+    Returns:
+    - pd.DataFrame: One row per combination, parameter columns first, sorted by parameters.
+    """
+    rows = list(iter_sweep(strategy_cls, grid, price, processes=processes, chunksize=chunksize))
+    names = list(grid.keys())
+    if not rows:
+        return pd.DataFrame(columns=names)
+    res = pd.DataFrame(rows)
+    # failed combinations keep their row, with the error last
+    metrics = [col for col in res.columns if col not in names and col != 'error']
+    res = res[names + metrics + (['error'] if 'error' in res.columns else [])]
+    return res.sort_values(names).reset_index(drop=True)
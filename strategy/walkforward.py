@@ -0,0 +1,185 @@
+"""
+Walk-forward optimization for VectorStrategy subclasses.
+
+History is split into rolling folds of `train` bars followed by `test` bars. For each fold the
+parameter combination with the best in-sample score is chosen, then scored on the following test
+window, and the test windows are stitched into one out-of-sample return series.
+
+Each parameter combination is run once over the whole history and every fold is scored on slices
+of that single run, so overlapping train windows reuse the same indicator values instead of
+recomputing them per fold (and no fold loses bars to indicator warmup). This assumes the strategy
+is causal: its signal at a bar only depends on bars up to that one, as with rolling-window indicators.
+
+Combinations are evaluated in parallel with the `sweep` shared-memory pool; the combinations chosen
+for the test windows are then re-run in parallel to extract their out-of-sample returns.
+
+Classes:
+- WalkForwardResult: Fold table, per-combination train scores and stitched out-of-sample curves.
+
+Functions:
+- walk_forward_folds(n_bars, train, test, step): Bar positions of each train/test fold.
+- walk_forward(strategy_cls, grid, price, train, test, step, metric, processes): Runs the optimization.
+
+Usage:
+>>> from strategy.strategies import XOverStrat
+>>> res = walk_forward(XOverStrat, {'slow': [100, 200], 'fast': [10, 20, 50]}, price, train=2000, test=500)
+>>> res.equity.plot()
+"""
+
+import typing as t
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from . import sweep as sw
+from .logic.stats import Stats, StatsReport
+
+
+@dataclass
+class WalkForwardResult:
+    """
+    Attributes:
+    - folds (pd.DataFrame): One row per fold: bar labels of the train/test windows, chosen parameters,
+      their train score and test score.
+    - scores (pd.DataFrame): Train score of every combination (rows) in every fold (columns).
+    - returns (pd.Series): Stitched out-of-sample log returns.
+    - equity (pd.Series): Cumulative out-of-sample return, like `Stats.cumulative_log_returns`.
+    """
+    folds: pd.DataFrame
+    scores: pd.DataFrame
+    returns: pd.Series
+    equity: pd.Series
+
+
+def walk_forward_folds(n_bars: int, train: int, test: int, step=None) -> t.List[t.Tuple[slice, slice]]:
+    """
+    Bar positions of rolling train/test folds.
+
+    Parameters:
+    - n_bars (int): Length of the history.
+    - train (int): Bars in each train window.
+    - test (int): Bars in each test window, starting right after its train window.
+    - step (int, optional): Bars between fold starts. Defaults to `test`, so test windows tile the history.
+
+    Returns:
+    - list[tuple[slice, slice]]: (train, test) slices; the last test window is cut short at the end of history.
+    """
+    step = step or test
+    folds = []
+    start = 0
+    while start + train < n_bars:
+        folds.append((slice(start, start + train), slice(start + train, min(start + train + test, n_bars))))
+        start += step
+    return folds
+
+
+def _score(returns: np.ndarray, trade_count: np.ndarray, window: slice, metric: str) -> float:
+    """whole-window value of `metric` on one slice of a run"""
+    r = pd.Series(returns[window])
+    tc = trade_count[window]
+    # count trades from the start of the window, not from the start of history
+    before = trade_count[window.start - 1] if window.start > 0 else 0.0
+    tc = pd.Series(tc - before)
+    res = StatsReport(r, tc).compute()[metric].dropna()
+    return float(res.iloc[-1]) if len(res) else np.nan
+
+
+def _run_strategy(strategy_cls, params):
+    strategy = strategy_cls(**params)
+    strategy.update(sw._worker_price)
+    stats = Stats(strategy)
+    returns = stats.log_returns.to_numpy(dtype=float)
+    trade_count = stats.trade_count.ffill().fillna(0).to_numpy(dtype=float)
+    return returns, trade_count
+
+
+def _train_scores(task):
+    i, strategy_cls, params, folds, metric = task
+    try:
+        returns, trade_count = _run_strategy(strategy_cls, params)
+        return i, [_score(returns, trade_count, train, metric) for train, _ in folds]
+    except Exception as e:
+        print(f'walk_forward: {params} failed: {type(e).__name__}: {e}')
+        return i, [np.nan] * len(folds)
+
+
+def _test_returns(task):
+    i, strategy_cls, params, folds, metric = task
+    returns, trade_count = _run_strategy(strategy_cls, params)
+    return i, [(returns[test], _score(returns, trade_count, test, metric)) for test in folds]
+
+
+def walk_forward(strategy_cls, grid: t.Dict[str, t.Iterable], price, train: int, test: int, step=None,
+                 metric='sharpe', processes=None) -> WalkForwardResult:
+    """
+    Optimizes `grid` on each train window and evaluates the best combination on the following test window.
+
+    Parameters:
+    - strategy_cls (type): An importable VectorStrategy subclass.
+    - grid (dict): Mapping of constructor argument name to the values to try.
+    - price (pd.DataFrame | pd.Series): Price history with a `close` column (a Series is treated as close).
+    - train (int): Bars in each train window.
+    - test (int): Bars in each test window.
+    - step (int, optional): Bars between fold starts. Defaults to `test`.
+    - metric (str, optional): `Stats.report` column to maximize. Defaults to 'sharpe'.
+    - processes (int, optional): Worker count. Defaults to os.cpu_count().
+
+    Returns:
+    - WalkForwardResult: The fold table, train scores and stitched out-of-sample curves.
+      Folds where no combination could be scored stay out of the market (zero returns).
+    """
+    if isinstance(price, pd.Series):
+        price = price.to_frame('close')
+    combos = sw.parameter_grid(grid)
+    folds = walk_forward_folds(len(price), train, test, step)
+    if not folds:
+        raise ValueError(f'walk_forward: {len(price)} bars is not enough for a {train} bar train window')
+    names = list(grid.keys())
+
+    with sw.shared_pool(price, processes) as pool:
+        scores = np.full((len(combos), len(folds)), np.nan)
+        tasks = ((i, strategy_cls, params, folds, metric) for i, params in enumerate(combos))
+        for i, row in pool.imap_unordered(_train_scores, tasks):
+            scores[i] = row
+
+        # best combination per fold; each chosen combination is re-run once for all the folds it won
+        best = {}
+        for f in range(len(folds)):
+            if not np.all(np.isnan(scores[:, f])):
+                best.setdefault(int(np.nanargmax(scores[:, f])), []).append(f)
+        tasks = ((i, strategy_cls, combos[i], [folds[f][1] for f in fs], metric) for i, fs in best.items())
+        tested = {}
+        for i, res in pool.imap_unordered(_test_returns, tasks):
+            tested.update(zip(best[i], res))
+
+    index = price.index
+    returns = pd.Series(np.nan, index=index[folds[0][1].start:])
+    rows = []
+    # with a step shorter than `test`, a later fold overwrites the overlap with its own (more recent) choice
+    for f, (train_window, test_window) in enumerate(folds):
+        labels = index[test_window]
+        row = {
+            'fold': f,
+            'train_start': index[train_window.start],
+            'train_end': index[train_window.stop - 1],
+            'test_start': labels[0],
+            'test_end': labels[-1],
+        }
+        if f in tested:
+            i = int(np.nanargmax(scores[:, f]))
+            test_returns, test_score = tested[f]
+            row.update(combos[i])
+            row['train_score'] = scores[i, f]
+            row['test_score'] = test_score
+            returns.loc[labels] = test_returns
+        else:
+            row.update({name: np.nan for name in names})
+            row['train_score'] = np.nan
+            row['test_score'] = np.nan
+            returns.loc[labels] = 0.0
+        rows.append(row)
+
+    scores = pd.DataFrame(scores, index=pd.MultiIndex.from_frame(pd.DataFrame(combos, columns=names)),
+                          columns=pd.Index(range(len(folds)), name='fold'))
+    returns = returns.fillna(0.0)
+    equity = returns.cumsum().apply(np.exp) - 1
+    return WalkForwardResult(pd.DataFrame(rows), scores, returns, equity)
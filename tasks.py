@@ -30,4 +30,22 @@ def activate(ctx):
 
 @task 
 def run_app(ctx):
-    ctx.run('streamlit run main.py')
\ No newline at end of file
+    ctx.run('streamlit run main.py')
+
+@task
+def benchmark(ctx, sizes='1e3 1e4 1e5', baseline=None):
+    cmd = f'python -m strategy.benchmark --sizes {sizes}'
+    if baseline:
+        cmd += f' --baseline {baseline}'
+    ctx.run(cmd)
+
+@task
+def startup_benchmark(ctx, baseline=None):
+    cmd = 'python -m source.code.startup_benchmark'
+    if baseline:
+        cmd += f' --baseline {baseline}'
+    ctx.run(cmd)
+
+@task
+def migrate(ctx):
+    ctx.run('python -m backend.db_setup migrate')
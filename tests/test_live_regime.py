@@ -0,0 +1,67 @@
+"""
+LiveRegime's tail recompute must give the same tables as a full `fc_scale_strategy_live` run.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+fcr = pytest.importorskip('src.floor_ceiling_regime')
+
+from strategy.indicators import LiveRegime, compact_tables, _table_fields
+
+
+def price_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    spread = close * rng.uniform(0.001, 0.02, n)
+    return pd.DataFrame({
+        'Datetime': pd.date_range('2023-01-01', periods=n, freq='h'),
+        'open': np.roll(close, 1),
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.uniform(100, 1000, n),
+    })
+
+
+def full_recompute(value):
+    value = value.reset_index(drop=True).reset_index().rename(columns={'index': 'bar_number'})
+    return compact_tables(fcr.fc_scale_strategy_live(value, find_retest_swing=False))
+
+
+def assert_same_tables(expected, actual):
+    for name in _table_fields(expected):
+        pd.testing.assert_frame_equal(
+            getattr(expected, name).reset_index(drop=True),
+            getattr(actual, name).reset_index(drop=True),
+            obj=name
+        )
+
+
+def test_appended_bars_match_full_recompute():
+    data = price_frame(900)
+    regime = LiveRegime()
+    regime.update(data.iloc[:600])
+    for end in range(620, 901, 20):
+        assert_same_tables(full_recompute(data.iloc[:end]), regime.update(data.iloc[:end]))
+
+
+def test_revised_forming_bar_matches_full_recompute():
+    data = price_frame(700, seed=1)
+    regime = LiveRegime()
+    regime.update(data.iloc[:650])
+    for end in range(651, 700):
+        forming = data.iloc[:end].copy()
+        # the last bar first arrives half-formed, then closes
+        forming.loc[forming.index[-1], ['close', 'high', 'low']] *= 0.99
+        regime.update(forming)
+        assert_same_tables(full_recompute(data.iloc[:end]), regime.update(data.iloc[:end]))
+
+
+def test_validate_accepts_matching_tail():
+    data = price_frame(800, seed=2)
+    regime = LiveRegime(validate=True)
+    regime.update(data.iloc[:700])
+    for end in range(710, 801, 10):
+        regime.update(data.iloc[:end])
@@ -0,0 +1,66 @@
+"""
+Approximate quantiles against exact ones.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# the strategy package imports the floor/ceiling regime code on import
+pytest.importorskip('src.floor_ceiling_regime')
+
+from strategy.logic.quantile import expanding_quantiles, rolling_quantiles
+
+QUANTILES = [0.05, 0.5, 0.95]
+REL_ERR = 0.01
+
+
+def returns(n, seed=0):
+    return pd.Series(np.random.default_rng(seed).normal(0, 0.01, n))
+
+
+@pytest.mark.parametrize('n', [1, 2, 3, 5, 10, 50])
+def test_expanding_small_samples_match_np_quantile(n):
+    values = returns(n)
+    approx = expanding_quantiles(values, QUANTILES, rel_err=REL_ERR)
+    for end in range(1, n + 1):
+        sample = values.iloc[:end].to_numpy()
+        exact = np.quantile(sample, QUANTILES)
+        # each interpolated neighbour is off by at most rel_err of its magnitude
+        bound = REL_ERR * np.abs(sample).max() + 1e-15
+        np.testing.assert_array_less(np.abs(approx.iloc[end - 1].to_numpy() - exact), bound)
+
+
+def test_two_values_95th_percentile_stays_near_the_maximum():
+    values = pd.Series([-0.0124, 0.0023])
+    approx = expanding_quantiles(values, [0.95], rel_err=REL_ERR).iloc[-1, 0]
+    assert approx == pytest.approx(np.quantile(values, 0.95), rel=REL_ERR, abs=REL_ERR * 0.0124)
+
+
+def test_expanding_within_rank_bound():
+    values = returns(20000, seed=1)
+    approx = expanding_quantiles(values, QUANTILES, rel_err=REL_ERR, rank_err=0.01)
+    for end in [200, 1000, 5000, 20000]:
+        sample = values.iloc[:end].to_numpy()
+        for q in QUANTILES:
+            low, high = np.quantile(sample, [max(q - 0.01, 0), min(q + 0.01, 1)])
+            value = approx[q].iloc[end - 1]
+            slack = REL_ERR * np.abs(sample).max()
+            assert low - slack <= value <= high + slack
+
+
+def test_rolling_within_rank_bound():
+    window = 4000
+    values = returns(12000, seed=2)
+    approx = rolling_quantiles(values, window, QUANTILES, rel_err=REL_ERR, rank_err=0.01)
+    assert approx.iloc[:window - 1].isna().all().all()
+    for end in [window, 7001, 12000]:
+        sample = values.iloc[end - window:end].to_numpy()
+        for q in QUANTILES:
+            # the checkpoint window lags by up to rank_err * window bars
+            lagged = values.iloc[max(end - window - 40, 0):end].to_numpy()
+            low = min(np.quantile(sample, max(q - 0.02, 0)), np.quantile(lagged, max(q - 0.02, 0)))
+            high = max(np.quantile(sample, min(q + 0.02, 1)), np.quantile(lagged, min(q + 0.02, 1)))
+            value = approx[q].iloc[end - 1]
+            slack = REL_ERR * np.abs(lagged).max()
+            assert low - slack <= value <= high + slack
@@ -0,0 +1,50 @@
+"""
+Product table helpers on tables shaped like the source tables, e.g. the CoinGecko categories.
+"""
+
+import numpy as np
+import pandas as pd
+
+from source.tools.utils import dataset_version, gradient_styles, query_rows
+
+
+def categories():
+    return pd.DataFrame({
+        'name': ['Layer 1', 'Meme', 'DeFi'],
+        'market_cap': [1.2e12, 5.5e10, np.nan],
+        'top_3_coins_id': [['bitcoin', 'ethereum', 'solana'], ['dogecoin', 'shiba-inu', 'pepe'], ['uniswap', 'aave', 'maker']],
+        'top_3_coins': [['btc.png', 'eth.png', 'sol.png'], ['doge.png', 'shib.png', 'pepe.png'], ['uni.png', 'aave.png', 'mkr.png']],
+    })
+
+
+def test_dataset_version_hashes_list_columns():
+    df = categories()
+    assert dataset_version(df) == dataset_version(categories())
+    changed = categories()
+    changed.at[1, 'top_3_coins_id'] = ['dogecoin', 'shiba-inu', 'bonk']
+    assert dataset_version(df) != dataset_version(changed)
+
+
+def test_dataset_version_changes_with_values_and_columns():
+    df = categories()
+    assert dataset_version(df) != dataset_version(df.assign(market_cap=df.market_cap * 2))
+    assert dataset_version(df) != dataset_version(df.rename(columns={'name': 'category'}))
+
+
+def test_viewer_helpers_accept_list_columns():
+    df = categories()
+    version = dataset_version(df)
+    styles = gradient_styles(df, version)
+    assert styles.shape == df.shape
+    assert (styles['top_3_coins'] == '').all()
+    assert styles['market_cap'].str.startswith('background-color').all()
+    assert list(query_rows(df, version, 'market_cap > 1e11')) == [0]
+
+
+def test_gradient_of_constant_column_matches_pandas():
+    df = pd.DataFrame({'name': ['a', 'b', 'c'], 'market_cap': [5.0, 5.0, 5.0]})
+    styles = gradient_styles(df, dataset_version(df))
+    expected = df.style.background_gradient(cmap='viridis', subset=['market_cap'])._compute().ctx
+    for row in range(len(df)):
+        # pandas stores each rule as a (property, value) pair
+        assert styles.at[row, 'market_cap'] == '; '.join(f'{k}: {v}' for k, v in expected[(row, 1)])